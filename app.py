@@ -5,15 +5,20 @@ import plotly.express as px
 from io import BytesIO
 import os
 import tempfile
+import time
 from typing import Dict, List
 
 # Import our custom modules
 from utils.resume_parser import ResumeParser
 from utils.analyzer import ResumeAnalyzer
-from utils.recommendations import RecommendationEngine
-from data.skills_database import get_all_skills
+from utils.pipeline import STAGE_LABELS, STAGES, build_pipeline
+from utils.jobs import AnalysisJobs
+from utils.what_if import WhatIfSession
 from data.sample_data import get_sample_job_description, get_sample_resume
 
+# Seconds between reruns while a background analysis is in progress
+JOB_POLL_SECONDS = 1.0
+
 # Page configuration
 st.set_page_config(
     page_title="AI Resume Analyzer",
@@ -101,11 +106,23 @@ if 'resume_data' not in st.session_state:
 @st.cache_resource
 def load_components():
     """Load and cache the analysis components"""
-    parser = ResumeParser()
-    analyzer = ResumeAnalyzer()
-    recommender = RecommendationEngine()
-    skills_db = get_all_skills()
-    return parser, analyzer, recommender, skills_db
+    # Uploads are untrusted, so PDF extraction stops at the parser's suggested budget
+    pipeline = build_pipeline(ResumeParser.MAX_PDF_PAGES, ResumeParser.MAX_TEXT_BYTES)
+    return pipeline.parser, pipeline.analyzer, pipeline.recommender, pipeline.skills_database
+
+@st.cache_resource
+def load_job_pool() -> AnalysisJobs:
+    """Background worker processes shared by every session"""
+    return AnalysisJobs(max_pages=ResumeParser.MAX_PDF_PAGES, max_bytes=ResumeParser.MAX_TEXT_BYTES)
+
+def get_what_if_session(analyzer: ResumeAnalyzer, job_description: str, skills_db: List[str]) -> WhatIfSession:
+    """Per-user live preview state, rebuilt when the job description changes"""
+    session = st.session_state.get('what_if_session')
+    if session is None or st.session_state.get('what_if_job') != job_description:
+        session = WhatIfSession(analyzer, job_description, skills_db)
+        st.session_state.what_if_session = session
+        st.session_state.what_if_job = job_description
+    return session
 
 def create_score_gauge(score: int) -> go.Figure:
     """Create a gauge chart for the overall score"""
@@ -225,6 +242,7 @@ def main():
     
     # Load components
     parser, analyzer, recommender, skills_db = load_components()
+    jobs = load_job_pool()
     
     # Header
     st.markdown("""
@@ -263,6 +281,15 @@ def main():
                 st.session_state.sample_job = job_desc
                 st.session_state.sample_resume = resume_text
                 st.success("Sample data loaded! Check the main panel.")
+        
+        # Analyses run in the job pool's workers, so their cache use is counted from the
+        # collected jobs' stage reports rather than this process's parser and analyzer
+        stage_stats = jobs.stats()
+        st.caption(
+            "Stage cache hits: " +
+            ", ".join(f"{STAGE_LABELS[stage]} {counts['hits']}/{counts['hits'] + counts['misses']}"
+                      for stage, counts in stage_stats.items())
+        )
     
     # Main content area
     col1, col2 = st.columns([1, 1])
@@ -306,6 +333,30 @@ def main():
             height=200,
             help="Copy and paste your resume text directly"
         )
+        
+        # The text area reruns the script once typing pauses (on blur or Ctrl+Enter), so each
+        # preview applies one batch of edits to the incremental scorer
+        live_preview = st.checkbox(
+            "Live what-if preview",
+            help="Update the compatibility score as you edit the resume text, without running the full analysis"
+        )
+        if live_preview and job_description.strip() and resume_text.strip():
+            try:
+                preview = get_what_if_session(analyzer, job_description, skills_db).update(resume_text)
+                previous = st.session_state.analysis_results
+                st.metric(
+                    "Live score preview",
+                    preview['overall_score'],
+                    delta=(preview['overall_score'] - previous['score_breakdown']['overall_score']) if previous else None
+                )
+                st.caption(
+                    f"Similarity {preview['similarity_score']}% · Skills match {preview['skill_match_percentage']}% · "
+                    f"Experience {preview['experience_years']} years · updated in {preview['update_ms']:.1f} ms"
+                )
+            except Exception as e:
+                st.warning(f"Live preview unavailable: {str(e)}")
+        elif live_preview:
+            st.caption("Paste a job description and resume text to see the live score.")
     
     # Analysis section
     st.markdown("---")
@@ -316,38 +367,23 @@ def main():
     
     if has_job_description and has_resume:
         if st.button(" Analyze Resume", type="primary", use_container_width=True):
-            with st.spinner(" Analyzing your resume... This may take a moment."):
-                try:
-                    # Parse resume
-                    if uploaded_file:
-                        # Handle file upload
-                        file_type = 'pdf' if uploaded_file.type == 'application/pdf' else 'docx'
-                        resume_data = parser.parse_resume(uploaded_file, file_type, skills_db)
-                    else:
-                        # Handle text input
-                        resume_data = parser.parse_resume(resume_text, 'text', skills_db)
-                    
-                    # Perform analysis
-                    analysis_results = analyzer.perform_full_analysis(resume_data, job_description)
-                    
-                    # Generate recommendations
-                    recommendations = recommender.generate_comprehensive_recommendations(
-                        resume_data, 
-                        analysis_results['job_requirements'],
-                        analysis_results['skill_analysis'],
-                        analysis_results['score_breakdown']
-                    )
-                    
-                    # Store results in session state
-                    st.session_state.analysis_results = analysis_results
-                    st.session_state.resume_data = resume_data
-                    st.session_state.recommendations = recommendations
-                    
-                    st.success(" Analysis completed successfully!")
-                    
-                except Exception as e:
-                    st.error(f" An error occurred during analysis: {str(e)}")
-                    st.info("Please check your resume format and try again.")
+            try:
+                if uploaded_file:
+                    # Handle file upload; workers receive the file's bytes
+                    file_type = 'pdf' if uploaded_file.type == 'application/pdf' else 'docx'
+                    resume_input = uploaded_file.getvalue()
+                else:
+                    # Handle text input
+                    file_type = 'text'
+                    resume_input = resume_text
+                
+                # Runs in a background worker; the result is picked up on a later rerun
+                previous_job = st.session_state.get('analysis_job')
+                if previous_job:
+                    jobs.discard(previous_job)
+                st.session_state.analysis_job = jobs.submit(resume_input, file_type, job_description)
+            except Exception as e:
+                st.error(f" Could not start the analysis: {str(e)}")
     
     else:
         # Show requirements
@@ -359,11 +395,52 @@ def main():
         
         st.info(f" Please provide {' and '.join(missing)} to start the analysis.")
     
+    # Collect or report on this session's background analysis
+    job_id = st.session_state.get('analysis_job')
+    if job_id:
+        status = jobs.status(job_id)
+        if status['state'] == 'done':
+            resume_data, analysis_results, recommendations, stage_report = jobs.result(job_id)
+            
+            # Store results in session state
+            st.session_state.analysis_results = analysis_results
+            st.session_state.resume_data = resume_data
+            st.session_state.recommendations = recommendations
+            st.session_state.stage_report = stage_report
+            st.session_state.analysis_job = None
+            
+            st.success(" Analysis completed successfully!")
+        elif status['state'] == 'failed':
+            jobs.discard(job_id)
+            st.session_state.analysis_job = None
+            st.error(f" An error occurred during analysis: {status['error']}")
+            st.info("Please check your resume format and try again.")
+        elif status['state'] == 'unknown':
+            st.session_state.analysis_job = None
+        else:
+            stage = STAGE_LABELS[status['stage']] if status['stage'] else "Waiting for a worker"
+            st.progress(
+                status['completed_stages'] / len(STAGES),
+                text=f" Analyzing (job {job_id[:8]}): {stage}..."
+            )
+    
     # Display results if available
     if st.session_state.analysis_results:
         st.markdown("---")
         st.header(" Analysis Results")
         
+        stage_report = st.session_state.get('stage_report')
+        if stage_report:
+            reused = sum(stage['cached'] for stage in stage_report)
+            st.caption(
+                f"Pipeline: {reused}/{len(stage_report)} stages reused — " +
+                ", ".join(
+                    f"{STAGE_LABELS[stage['stage']]} {'cached' if stage['cached'] else 'computed'} "
+                    f"({stage['seconds'] * 1000:.0f} ms)"
+                    for stage in stage_report
+                )
+            )
+        
         analysis = st.session_state.analysis_results
         resume_data = st.session_state.resume_data
         recommendations = st.session_state.recommendations
@@ -449,6 +526,11 @@ def main():
                 st.write(f"**Email:** {contact_info.get('email', 'Not found')}")
             with col3:
                 st.write(f"**Phone:** {contact_info.get('phone', 'Not found')}")
+    
+    # Rerun until the background analysis finishes, so its progress updates by itself
+    if st.session_state.get('analysis_job'):
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
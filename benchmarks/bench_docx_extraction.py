@@ -0,0 +1,54 @@
+"""Compare the streaming DOCX extractor with the python-docx object model.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_docx_extraction
+"""
+import io
+import time
+import tracemalloc
+
+import docx
+
+from utils.resume_parser import ResumeParser
+
+def build_docx(paragraphs: int = 400, table_rows: int = 40) -> bytes:
+    """Build a synthetic resume-sized DOCX with body paragraphs and a skills table"""
+    document = docx.Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"• Delivered project {i} using Python, Django and AWS with 3 years of experience")
+    table = document.add_table(rows=table_rows, cols=3)
+    for row_index, row in enumerate(table.rows):
+        for col_index, cell in enumerate(row.cells):
+            cell.text = f"Skill {row_index}-{col_index}: Kubernetes"
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+def measure(extract, content: bytes, repeats: int = 20):
+    """Return mean seconds per call and peak traced memory in bytes"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        text = extract(io.BytesIO(content))
+    elapsed = (time.perf_counter() - start) / repeats
+
+    tracemalloc.start()
+    extract(io.BytesIO(content))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(text)
+
+def main():
+    parser = ResumeParser()
+    content = build_docx()
+    paths = [
+        ('streaming (zip + iterparse)', parser.extract_text_from_docx),
+        ('python-docx', parser.extract_text_from_docx_document),
+    ]
+    print(f"DOCX size: {len(content) / 1024:.1f} KiB")
+    for name, extract in paths:
+        elapsed, peak, characters = measure(extract, content)
+        print(f"{name:<30} {elapsed * 1000:8.2f} ms/doc  peak {peak / 1024:8.1f} KiB  {characters} chars")
+
+if __name__ == "__main__":
+    main()
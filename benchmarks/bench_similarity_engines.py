@@ -0,0 +1,34 @@
+"""Report similarity scores and timings for each ResumeAnalyzer similarity engine.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_similarity_engines
+"""
+import time
+
+from data.sample_data import SAMPLE_JOB_DESCRIPTIONS, SAMPLE_RESUMES
+from utils.analyzer import SIMILARITY_ENGINES, ResumeAnalyzer
+
+def main(repeats: int = 50):
+    analyzers = {engine: ResumeAnalyzer(similarity_engine=engine) for engine in SIMILARITY_ENGINES}
+    pairs = [(resume, job) for resume in SAMPLE_RESUMES for job in SAMPLE_JOB_DESCRIPTIONS]
+
+    print(f"{'resume':<20} {'job':<20} " + ' '.join(f"{engine:>10}" for engine in SIMILARITY_ENGINES))
+    for resume, job in pairs:
+        scores = [
+            analyzers[engine].calculate_similarity_score(SAMPLE_RESUMES[resume], SAMPLE_JOB_DESCRIPTIONS[job])
+            for engine in SIMILARITY_ENGINES
+        ]
+        print(f"{resume:<20} {job:<20} " + ' '.join(f"{score:>10.4f}" for score in scores))
+
+    print()
+    for engine, analyzer in analyzers.items():
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for resume, job in pairs:
+                analyzer.calculate_similarity_score(SAMPLE_RESUMES[resume], SAMPLE_JOB_DESCRIPTIONS[job])
+        elapsed = (time.perf_counter() - start) / (repeats * len(pairs))
+        print(f"{engine:<10} {elapsed * 1000:8.3f} ms/pair")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Profile parse -> analyze -> recommend with one Document per text versus plain strings.
+
+The document run keeps the Document each resume was parsed from and builds one Document
+per job description, passing them to the analyzer and recommender, so every view is
+computed once per text. The string run hands each step the raw text, as callers did
+before, so each step rewraps and re-preprocesses it. Needs the spaCy model (or a cached
+requirements entry) like the app does.
+
+Run from the repository root:
+
+    python -m benchmarks.profile_document_views
+"""
+import cProfile
+import pstats
+import time
+
+from data.sample_data import SAMPLE_JOB_DESCRIPTIONS, SAMPLE_RESUMES
+from data.skills_database import get_all_skills
+from utils.analyzer import ResumeAnalyzer
+from utils.document import Document
+from utils.recommendations import RecommendationEngine
+from utils.resume_parser import ResumeParser
+
+VIEWS = ('lower', 'normalized', 'preprocessed', 'tokens', 'word_count', 'lines')
+
+def analyze_with_strings(analyzer, resume_data, job_description):
+    """perform_full_analysis's steps, handing every call the raw strings"""
+    job_requirements = analyzer.get_job_requirements(job_description)
+    similarity_score = analyzer.calculate_similarity_score(resume_data['raw_text'], job_description)
+    analyzer.calculate_semantic_similarity(resume_data['raw_text'], job_description)
+    skill_analysis = analyzer.analyze_skill_match(resume_data['skills'], job_requirements)
+    score_breakdown = analyzer.generate_score_breakdown(resume_data, job_requirements, skill_analysis, similarity_score)
+    return {'job_requirements': job_requirements, 'skill_analysis': skill_analysis, 'score_breakdown': score_breakdown}
+
+def run_pipeline(parser, analyzer, recommender, skills_database, repeats, shared):
+    for _ in range(repeats):
+        if shared:
+            job_descriptions = [Document(text) for text in SAMPLE_JOB_DESCRIPTIONS.values()]
+        else:
+            job_descriptions = list(SAMPLE_JOB_DESCRIPTIONS.values())
+        for resume_text in SAMPLE_RESUMES.values():
+            if shared:
+                resume_data, resume_document = parser.parse_resume_document(resume_text, 'text', skills_database)
+            else:
+                resume_data, resume_document = parser.parse_resume(resume_text, 'text', skills_database), None
+            for job_description in job_descriptions:
+                if shared:
+                    analysis = analyzer.perform_full_analysis(resume_data, job_description, resume_document)
+                else:
+                    analysis = analyze_with_strings(analyzer, resume_data, job_description)
+                recommender.generate_comprehensive_recommendations(
+                    resume_data, analysis['job_requirements'],
+                    analysis['skill_analysis'], analysis['score_breakdown'], resume_document
+                )
+
+def profile(shared: bool, repeats: int):
+    parser = ResumeParser()
+    analyzer = ResumeAnalyzer(similarity_engine='hashing')
+    recommender = RecommendationEngine()
+    skills_database = get_all_skills()
+    # Warm the requirements cache so both runs measure the same per-analysis work
+    analyzer.get_job_requirements_batch(list(SAMPLE_JOB_DESCRIPTIONS.values()))
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    run_pipeline(parser, analyzer, recommender, skills_database, repeats, shared)
+    profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    calls = {}
+    for (filename, _, name), (_, primitive_calls, *_) in pstats.Stats(profiler).stats.items():
+        if filename.endswith('document.py') and name in VIEWS:
+            calls[name] = primitive_calls
+    return elapsed, calls
+
+def main(repeats: int = 20):
+    analyses = repeats * len(SAMPLE_RESUMES) * len(SAMPLE_JOB_DESCRIPTIONS)
+    profile(True, 1)  # warm-up: imports, skill matcher and vectorizer setup
+    for label, shared in (('strings', False), ('document', True)):
+        elapsed, calls = profile(shared, repeats)
+        computed = ', '.join(f"{name}={count}" for name, count in sorted(calls.items()))
+        print(f"{label:<9} {elapsed / analyses * 1000:8.3f} ms/analysis  views computed: {computed}")
+
+if __name__ == "__main__":
+    main()
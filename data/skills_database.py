@@ -1,3 +1,5 @@
+import hashlib
+
 TECHNICAL_SKILLS = [
     # Programming Languages
     'Python', 'Java', 'JavaScript', 'TypeScript', 'C++', 'C#', 'C', 'Go', 'Rust', 'Swift',
@@ -71,4 +73,9 @@ def get_skills_by_category():
         'soft': SOFT_SKILLS,
         'certifications': CERTIFICATIONS,
         'industries': INDUSTRIES
-    }
\ No newline at end of file
+    }
+
+def get_skills_version(skills=None):
+    """Return a short fingerprint of the skills database, for keying caches"""
+    skills = get_all_skills() if skills is None else skills
+    return hashlib.sha1('\n'.join(skills).encode('utf-8')).hexdigest()[:12]
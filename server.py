@@ -0,0 +1,377 @@
+"""Headless JSON scoring service.
+
+Run from the repository root:
+
+    python server.py --port 8000 --workers 4
+
+Endpoints (POST bodies and responses are JSON):
+
+    GET  /health     liveness and the serving worker's pid
+    POST /parse      {"resume": RESUME}                        -> parse_resume output
+    POST /analyze    {"resume": RESUME | "resume_data": {...},
+                      "job_description": str}                  -> perform_full_analysis output
+    POST /recommend  {"resume_data", "job_requirements",
+                      "skill_analysis", "score_breakdown"}     -> recommendations
+    POST /batch      {"resumes": [RESUME, ...],
+                      "job_description": str}                  -> per-resume results and a ranking
+    GET  /metrics    queue depth, load and wait times of the serving worker's lanes
+
+A RESUME is {"text": str} or {"content_base64": str, "file_type": "pdf" | "docx"}.
+
+PDF/DOCX parsing and text analysis run in separate admission lanes per worker, each with
+its own concurrency and bounded queue. Requests may send an integer X-Priority header
+(higher runs first, default 0). Overload is answered at once with 503 and Retry-After;
+a /batch that hits overload part way returns its finished items, and the remaining ones
+carry an error and their own retry_after.
+"""
+import argparse
+import base64
+import binascii
+import json
+import os
+import signal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.admission import AdmissionController, Overloaded
+from utils.document import Document
+from utils.nlp_registry import NER_PIPES, get_nlp
+from utils.pipeline import build_pipeline
+from utils.resume_parser import ResumeParser
+
+MAX_REQUEST_BYTES = 32 * 1024 * 1024
+
+NUMBER = (int, float)
+OPTIONAL_STRING = (str, type(None))
+# A one-element list stands for a JSON array whose items all have that type
+STRINGS = [str]
+
+# Fields of client-supplied objects read by the analyzer and recommender, with their JSON types
+RESUME_DATA_FIELDS = {'raw_text': str, 'skills': STRINGS, 'experience_years': NUMBER}
+RECOMMEND_FIELDS = {
+    'resume_data': {'experience_years': NUMBER, 'word_count': NUMBER, 'contact_info': dict},
+    'job_requirements': {'technical_skills': STRINGS, 'experience_years': NUMBER},
+    'skill_analysis': {'matched_skills': STRINGS, 'missing_skills': STRINGS},
+    'score_breakdown': {'overall_score': NUMBER},
+}
+CONTACT_INFO_FIELDS = {'email': OPTIONAL_STRING, 'phone': OPTIONAL_STRING}
+
+class RequestError(Exception):
+    def __init__(self, message: str, status: int = 400):
+        """An error reported to the client with an HTTP status"""
+        super().__init__(message)
+        self.status = status
+
+def to_json(value):
+    """json.dumps fallback for NumPy scalars and arrays"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class ScoringService:
+    def __init__(self, admission: Optional[AdmissionController] = None,
+                 max_pages: Optional[int] = ResumeParser.MAX_PDF_PAGES,
+                 max_bytes: Optional[int] = ResumeParser.MAX_TEXT_BYTES):
+        """Parser, analyzer and recommender, loaded once per worker process.
+
+        Uploads are untrusted, so PDF extraction stops after max_pages pages or max_bytes of text.
+        """
+        self.admission = admission or AdmissionController()
+        pipeline = build_pipeline(max_pages, max_bytes)
+        self.parser = pipeline.parser
+        self.analyzer = pipeline.analyzer
+        self.recommender = pipeline.recommender
+        self.skills_database = pipeline.skills_database
+        # Load the spaCy model now rather than on the first request
+        get_nlp(NER_PIPES)
+
+    @staticmethod
+    def read_resume(resume) -> Tuple[object, str]:
+        """Return (file_content, file_type) for parse_resume from a RESUME object"""
+        if not isinstance(resume, dict):
+            raise RequestError("'resume' must be an object with 'text' or 'content_base64'")
+        if 'text' in resume:
+            if not isinstance(resume['text'], str):
+                raise RequestError("'text' must be a string")
+            return resume['text'], 'text'
+        if 'content_base64' in resume:
+            file_type = resume.get('file_type')
+            if file_type not in ('pdf', 'docx'):
+                raise RequestError("'file_type' must be 'pdf' or 'docx'")
+            try:
+                content = base64.b64decode(resume['content_base64'], validate=True)
+            except (binascii.Error, TypeError, ValueError):
+                raise RequestError("'content_base64' is not valid base64")
+            return BytesIO(content), file_type
+        raise RequestError("'resume' must contain 'text' or 'content_base64'")
+
+    def parse_resume(self, resume, priority: int = 0) -> Tuple[Dict, Document]:
+        """Return (parse_resume output, Document of the resume text)"""
+        file_content, file_type = self.read_resume(resume)
+        # PDF and DOCX wait in the extraction lane, plain text in the analysis lane
+        with self.admission.lane_for(file_type).slot(priority):
+            try:
+                return self.parser.parse_resume_document(file_content, file_type, self.skills_database)
+            except Exception as e:
+                raise RequestError(str(e), status=422)
+
+    def analyze_resume(self, resume_data: Dict, job_description: str, priority: int = 0,
+                       resume_document: Optional[Document] = None) -> Dict:
+        with self.admission.lane_for().slot(priority):
+            return self.analyzer.perform_full_analysis(resume_data, job_description, resume_document)
+
+    def parse(self, payload: Dict, priority: int = 0) -> Dict:
+        return self.parse_resume(payload.get('resume'), priority)[0]
+
+    def analyze(self, payload: Dict, priority: int = 0) -> Dict:
+        job_description = require(payload, 'job_description', str)
+        if payload.get('resume_data'):
+            resume_data = require_fields(require(payload, 'resume_data', dict), 'resume_data', RESUME_DATA_FIELDS)
+            resume_document = None
+        else:
+            resume_data, resume_document = self.parse_resume(payload.get('resume'), priority)
+        return self.analyze_resume(resume_data, job_description, priority, resume_document)
+
+    def recommend(self, payload: Dict, priority: int = 0) -> Dict:
+        inputs = {
+            name: require_fields(require(payload, name, dict), name, fields)
+            for name, fields in RECOMMEND_FIELDS.items()
+        }
+        require_fields(inputs['resume_data']['contact_info'], 'resume_data.contact_info', CONTACT_INFO_FIELDS)
+        with self.admission.lane_for().slot(priority):
+            return self.recommender.generate_comprehensive_recommendations(
+                inputs['resume_data'], inputs['job_requirements'], inputs['skill_analysis'], inputs['score_breakdown']
+            )
+
+    def batch(self, payload: Dict, priority: int = 0) -> Dict:
+        """Parse, analyze and recommend every resume against one job description"""
+        job_description = require(payload, 'job_description', str)
+        resumes = require(payload, 'resumes', list)
+        # Shared by every resume, so the job description is preprocessed once per batch
+        job_document = Document(job_description)
+
+        results: List[Dict] = []
+        shed: Optional[Overloaded] = None
+        for index, resume in enumerate(resumes):
+            if shed is not None:
+                # Items after a shed one are not attempted, so an overloaded batch answers quickly
+                results.append({'index': index, 'error': str(shed), 'retry_after': shed.retry_after})
+                continue
+            try:
+                # Slots are taken per resume, so a large batch interleaves with other requests
+                resume_data, resume_document = self.parse_resume(resume, priority)
+                with self.admission.lane_for().slot(priority):
+                    analysis = self.analyzer.perform_full_analysis(resume_data, job_document, resume_document)
+                    recommendations = self.recommender.generate_comprehensive_recommendations(
+                        resume_data, analysis['job_requirements'], analysis['skill_analysis'],
+                        analysis['score_breakdown'], resume_document
+                    )
+            except RequestError as e:
+                results.append({'index': index, 'error': str(e)})
+                continue
+            except Overloaded as e:
+                # Keep the finished items; the client retries the rest after retry_after seconds
+                shed = e
+                results.append({'index': index, 'error': str(e), 'retry_after': e.retry_after})
+                continue
+            except Exception as e:
+                # One bad resume never costs the rest of the batch
+                results.append({'index': index, 'error': f"Internal error: {e}"})
+                continue
+            results.append({
+                'index': index,
+                'resume_data': resume_data,
+                'analysis': analysis,
+                'recommendations': recommendations
+            })
+
+        # Ranked on each result's own scores, so the ranking always agrees with the analyses
+        ranking = sorted(
+            (
+                {
+                    'index': result['index'],
+                    'overall_score': result['analysis']['score_breakdown']['overall_score'],
+                    'similarity_score': float(result['analysis']['similarity_score']),
+                    'matched_skills_count': len(result['analysis']['skill_analysis']['matched_skills'])
+                }
+                for result in results if 'analysis' in result
+            ),
+            key=lambda entry: (-entry['overall_score'], -entry['similarity_score'], entry['index'])
+        )
+        return {'results': results, 'ranking': ranking}
+
+def require(payload: Dict, field: str, kind: type):
+    """Return a required field of the request body, checking its JSON type"""
+    value = payload.get(field)
+    if not isinstance(value, kind):
+        raise RequestError(f"'{field}' is required and must be a {kind.__name__}")
+    return value
+
+def require_fields(value: Dict, name: str, fields: Dict[str, object]) -> Dict:
+    """Check that a client-supplied object has every field the analysis reads, with its JSON type"""
+    for field, kind in fields.items():
+        if field not in value:
+            raise RequestError(f"'{name}' is missing '{field}'")
+        if isinstance(kind, list):
+            item_kind = kind[0]
+            if not isinstance(value[field], list) or not all(isinstance(item, item_kind) for item in value[field]):
+                raise RequestError(f"'{name}.{field}' must be a list of {item_kind.__name__}")
+            continue
+        if not isinstance(value[field], kind):
+            kinds = kind if isinstance(kind, tuple) else (kind,)
+            expected = ' or '.join('null' if k is type(None) else k.__name__ for k in kinds)
+            raise RequestError(f"'{name}.{field}' must be {expected}")
+    return value
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+    ROUTES = {
+        '/parse': 'parse',
+        '/analyze': 'analyze',
+        '/recommend': 'recommend',
+        '/batch': 'batch',
+    }
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'status': 'ok', 'worker': os.getpid()})
+        elif self.path == '/metrics':
+            self.send_json(200, {'worker': os.getpid(), 'lanes': self.server.service.admission.stats()})
+        else:
+            self.send_json(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        endpoint = self.ROUTES.get(self.path)
+        if endpoint is None:
+            self.close_connection = True
+            self.send_json(404, {'error': f"Unknown path {self.path}"})
+            return
+        try:
+            payload = self.read_json()
+            result = getattr(self.server.service, endpoint)(payload, self.read_priority())
+        except RequestError as e:
+            self.send_json(e.status, {'error': str(e)})
+            return
+        except Overloaded as e:
+            self.send_json(503, {'error': str(e), 'lane': e.lane}, {'Retry-After': str(e.retry_after)})
+            return
+        except Exception as e:
+            self.send_json(500, {'error': f"Internal error: {e}"})
+            return
+        self.send_json(200, result)
+
+    def read_priority(self) -> int:
+        try:
+            return int(self.headers.get('X-Priority', 0))
+        except ValueError:
+            raise RequestError("X-Priority must be an integer")
+
+    def read_json(self) -> Dict:
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            raise RequestError("Invalid Content-Length")
+        if length < 0:
+            # rfile.read(-1) would block until the client closes the connection
+            self.close_connection = True
+            raise RequestError("Invalid Content-Length")
+        if length > MAX_REQUEST_BYTES:
+            # The body is left unread, so the connection cannot be reused
+            self.close_connection = True
+            raise RequestError(f"Request body exceeds {MAX_REQUEST_BYTES} bytes", status=413)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise RequestError("Request body must be JSON")
+        if not isinstance(payload, dict):
+            raise RequestError("Request body must be a JSON object")
+        return payload
+
+    def send_json(self, status: int, body, headers: Dict[str, str] = None) -> None:
+        data = json.dumps(body, default=to_json).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+def run_worker(server: ThreadingHTTPServer, admission: Optional[AdmissionController] = None,
+               max_pages: Optional[int] = ResumeParser.MAX_PDF_PAGES,
+               max_bytes: Optional[int] = ResumeParser.MAX_TEXT_BYTES) -> None:
+    """Preload the models, then serve requests on the shared listening socket"""
+    server.service = ScoringService(admission, max_pages, max_bytes)
+    print(f"Worker {os.getpid()} ready")
+    server.serve_forever()
+
+def serve(host: str = '0.0.0.0', port: int = 8000, workers: int = 1,
+          admission: Optional[AdmissionController] = None,
+          max_pages: Optional[int] = ResumeParser.MAX_PDF_PAGES,
+          max_bytes: Optional[int] = ResumeParser.MAX_TEXT_BYTES) -> None:
+    """Bind once, then fork worker processes that all accept on the same socket.
+
+    Each worker gets its own copy of the admission lanes, so the limits apply per worker.
+    """
+    server = ThreadingHTTPServer((host, port), ScoringRequestHandler)
+    print(f"Scoring service listening on http://{host}:{port} with {workers} worker(s)")
+    if workers <= 1 or not hasattr(os, 'fork'):
+        try:
+            run_worker(server, admission, max_pages, max_bytes)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            # Workers exit on SIGTERM from the parent
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            try:
+                run_worker(server, admission, max_pages, max_bytes)
+            finally:
+                os._exit(1)
+        children.append(pid)
+    server.socket.close()
+
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Serve resume scoring as a JSON HTTP API")
+    arg_parser.add_argument('--host', default='0.0.0.0')
+    arg_parser.add_argument('--port', type=int, default=8000)
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes accepting on the shared port")
+    arg_parser.add_argument('--extraction-concurrency', type=int, default=2,
+                            help="PDF/DOCX parses running at once, per worker")
+    arg_parser.add_argument('--analysis-concurrency', type=int, default=4,
+                            help="Text parses and analyses running at once, per worker")
+    arg_parser.add_argument('--queue-size', type=int, default=32,
+                            help="Requests allowed to wait in each lane before new ones are shed")
+    arg_parser.add_argument('--max-wait', type=float, default=5.0,
+                            help="Seconds a request may wait for a slot before it is shed")
+    arg_parser.add_argument('--max-pages', type=int, default=ResumeParser.MAX_PDF_PAGES,
+                            help="PDF pages read per upload (0 reads every page)")
+    arg_parser.add_argument('--max-text-bytes', type=int, default=ResumeParser.MAX_TEXT_BYTES,
+                            help="Bytes of PDF text kept per upload (0 keeps all of it)")
+    args = arg_parser.parse_args()
+    admission = AdmissionController(args.extraction_concurrency, args.analysis_concurrency,
+                                    args.queue_size, args.max_wait)
+    serve(args.host, args.port, args.workers, admission, args.max_pages or None, args.max_text_bytes or None)
+
+if __name__ == "__main__":
+    main()
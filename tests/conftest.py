@@ -0,0 +1,14 @@
+import pytest
+import spacy
+
+from utils import nlp_registry
+
+@pytest.fixture
+def nlp(monkeypatch):
+    """The installed spaCy model, or a blank English pipeline (no entities) without it"""
+    try:
+        return nlp_registry.get_nlp(nlp_registry.NER_PIPES)
+    except Exception:
+        model = spacy.blank('en')
+        monkeypatch.setitem(nlp_registry._models, (nlp_registry.MODEL_NAME, nlp_registry.NER_PIPES), model)
+        return model
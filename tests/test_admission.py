@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from utils.admission import Lane, Overloaded
+
+def wait_for_queue_depth(lane: Lane, depth: int, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while lane.stats()['queue_depth'] != depth:
+        assert time.monotonic() < deadline, f"queue never reached depth {depth}"
+        time.sleep(0.005)
+
+def start_waiter(lane: Lane, priority: int, outcomes: dict, name: str) -> threading.Thread:
+    """Acquire in a background thread, recording 'admitted' or the Overloaded raised"""
+    def run():
+        try:
+            lane.acquire(priority)
+        except Overloaded as e:
+            outcomes[name] = e
+            return
+        outcomes[name] = 'admitted'
+        lane.release(0.0)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+def test_higher_priority_arrival_sheds_lowest_waiter():
+    lane = Lane('test', concurrency=1, max_queue=1, max_wait=5.0)
+    lane.acquire()
+    outcomes = {}
+    low = start_waiter(lane, 0, outcomes, 'low')
+    wait_for_queue_depth(lane, 1)
+
+    # An arrival no more important than the waiter is the one shed
+    with pytest.raises(Overloaded):
+        lane.acquire(0)
+
+    high = start_waiter(lane, 5, outcomes, 'high')
+    low.join(5.0)
+    assert isinstance(outcomes['low'], Overloaded)
+    wait_for_queue_depth(lane, 1)
+
+    lane.release(0.0)
+    high.join(5.0)
+    assert outcomes['high'] == 'admitted'
+    assert lane.stats()['shed'] == 2
+
+def test_waiter_is_shed_at_max_wait():
+    lane = Lane('test', concurrency=1, max_queue=10, max_wait=0.2)
+    lane.acquire()
+    start = time.monotonic()
+    with pytest.raises(Overloaded):
+        lane.acquire()
+    waited = time.monotonic() - start
+    assert 0.2 <= waited < 2.0
+    assert lane.stats()['queue_depth'] == 0
+
+    # The timed-out waiter left the queue, so a freed slot is taken at once
+    lane.release(0.0)
+    lane.acquire()
+    assert lane.stats()['active'] == 1
+
+def test_zero_max_queue_sheds_immediately_when_busy():
+    lane = Lane('test', concurrency=1, max_queue=0, max_wait=5.0)
+    lane.acquire()
+    start = time.monotonic()
+    with pytest.raises(Overloaded):
+        lane.acquire(10)
+    assert time.monotonic() - start < 0.5
+
+    lane.release(0.0)
+    lane.acquire()
+    assert lane.stats()['admitted'] == 2
+
+def test_retry_after_covers_the_backlog():
+    lane = Lane('test', concurrency=2, max_queue=0, max_wait=5.0)
+    lane.acquire()
+    lane.acquire()
+    # No service time measured yet: retry after the one-second minimum
+    with pytest.raises(Overloaded) as shed:
+        lane.acquire()
+    assert shed.value.retry_after == 1
+    lane.release(4.0)
+    lane.release(4.0)
+
+    for _ in range(50):
+        lane.acquire()
+        lane.release(4.0)
+    # Two active, plus this request, at about 4 s each on 2 slots: 6 s
+    lane.acquire()
+    lane.acquire()
+    with pytest.raises(Overloaded) as shed:
+        lane.acquire()
+    assert shed.value.retry_after == 6
+    assert shed.value.lane == 'test'
@@ -0,0 +1,54 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from data.sample_data import SAMPLE_JOB_DESCRIPTIONS, SAMPLE_RESUMES
+from data.skills_database import get_all_skills
+from utils.analyzer import ResumeAnalyzer
+from utils.requirements_cache import RequirementsCache
+from utils.resume_parser import ResumeParser
+
+THREADS = 8
+ROUNDS = 10
+
+def fingerprint(analysis: dict) -> str:
+    """Canonical JSON of an analysis, with list order normalized"""
+    def normalize(value):
+        if isinstance(value, dict):
+            return {key: normalize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return sorted(normalize(item) for item in value)
+        if isinstance(value, float):
+            return round(value, 9)
+        return value
+    return json.dumps(normalize(analysis), sort_keys=True)
+
+def new_analyzer(similarity_engine: str) -> ResumeAnalyzer:
+    # A cache smaller than the set of postings keeps entries being evicted while threads read them
+    return ResumeAnalyzer(idf_model_path=None, semantic_index_path=None, similarity_engine=similarity_engine,
+                          requirements_cache=RequirementsCache(maxsize=1))
+
+@pytest.mark.parametrize('similarity_engine', ['tfidf', 'hashing'])
+def test_shared_analyzer_is_deterministic_across_threads_and_runs(nlp, similarity_engine):
+    # Mirrors the Streamlit deployment, where st.cache_resource hands every session the same analyzer
+    parser = ResumeParser()
+    skills_database = get_all_skills()
+    resumes = {name: parser.parse_resume(text, 'text', skills_database) for name, text in SAMPLE_RESUMES.items()}
+    pairs = [(resume, job) for resume in resumes for job in SAMPLE_JOB_DESCRIPTIONS]
+
+    def analyze(analyzer, pair):
+        resume, job = pair
+        return fingerprint(analyzer.perform_full_analysis(resumes[resume], SAMPLE_JOB_DESCRIPTIONS[job]))
+
+    # Reference results computed serially on a separate analyzer
+    reference = new_analyzer(similarity_engine)
+    expected = {pair: analyze(reference, pair) for pair in pairs}
+
+    for _ in range(2):
+        analyzer = new_analyzer(similarity_engine)
+        work = pairs * ROUNDS
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            results = list(executor.map(lambda pair: analyze(analyzer, pair), work))
+        mismatches = [pair for pair, result in zip(work, results) if result != expected[pair]]
+        assert mismatches == []
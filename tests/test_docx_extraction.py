@@ -0,0 +1,58 @@
+import io
+
+import docx
+from docx.oxml import parse_xml
+
+from utils.resume_parser import ResumeParser
+
+# A run holding a text box the way Word saves it: DrawingML in mc:Choice, VML in mc:Fallback
+TEXT_BOX_RUN = (
+    '<w:r xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+    ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+    ' xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"'
+    ' xmlns:v="urn:schemas-microsoft-com:vml">'
+    '<mc:AlternateContent>'
+    '<mc:Choice Requires="wps"><w:drawing><wps:txbx><w:txbxContent>'
+    '<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></wps:txbx></w:drawing></mc:Choice>'
+    '<mc:Fallback><w:pict><v:shape><v:textbox><w:txbxContent>'
+    '<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+    '</w:txbxContent></v:textbox></v:shape></w:pict></mc:Fallback>'
+    '</mc:AlternateContent>'
+    '</w:r>'
+)
+
+def save(document) -> io.BytesIO:
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+def test_plain_paragraphs_match_python_docx():
+    document = docx.Document()
+    for line in ("Jane Doe", "Python developer\twith 5 years of experience", ""):
+        document.add_paragraph(line)
+    content = save(document).getvalue()
+
+    parser = ResumeParser()
+    assert parser.extract_text_from_docx(io.BytesIO(content)) == \
+        parser.extract_text_from_docx_document(io.BytesIO(content))
+
+def test_text_box_is_read_once():
+    document = docx.Document()
+    header = document.add_paragraph()
+    header._p.append(parse_xml(TEXT_BOX_RUN.format(text="Contact: jane@x.com")))
+    document.add_paragraph("Body")
+
+    text = ResumeParser().extract_text_from_docx(save(document))
+    assert text == "Contact: jane@x.com\n\nBody\n"
+
+def test_text_box_does_not_inflate_word_count():
+    document = docx.Document()
+    header = document.add_paragraph()
+    header._p.append(parse_xml(TEXT_BOX_RUN.format(text="Contact: jane@x.com")))
+    document.add_paragraph("Body")
+
+    resume_data = ResumeParser().parse_resume(save(document), 'docx', [])
+    assert resume_data['word_count'] == 3
+    assert resume_data['contact_info']['email'] == "jane@x.com"
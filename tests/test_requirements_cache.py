@@ -0,0 +1,39 @@
+import pytest
+
+from utils.analyzer import ResumeAnalyzer
+from utils.compatibility_matrix import compute_compatibility_matrix
+from utils.requirements_cache import RequirementsCache
+
+def job_description(index: int) -> str:
+    return (f"Posting {index}: we need a python and sql engineer with {index % 9 + 1}+ years of experience, "
+            f"docker and aws a plus. Bachelor's degree in computer science.")
+
+@pytest.fixture
+def analyzer(nlp):
+    return ResumeAnalyzer(idf_model_path=None, semantic_index_path=None,
+                          requirements_cache=RequirementsCache(maxsize=8))
+
+def test_batch_larger_than_cache_returns_every_result(analyzer):
+    # More distinct postings than the cache holds, plus repeats
+    job_descriptions = [job_description(index) for index in range(30)] + [job_description(3), job_description(29)]
+    results = analyzer.get_job_requirements_batch(job_descriptions)
+
+    reference = ResumeAnalyzer(idf_model_path=None, semantic_index_path=None)
+    assert results == [reference.get_job_requirements(text) for text in job_descriptions]
+    stats = analyzer.requirements_cache.stats()
+    assert stats['hits'] + stats['misses'] == len(job_descriptions)
+    assert stats['entries'] == 8
+
+def test_requirements_ignore_whitespace_differences(analyzer):
+    text = job_description(1)
+    spaced = text.replace(' ', '\n   ')
+    assert analyzer.get_job_requirements_batch([spaced]) == [analyzer.get_job_requirements(text)]
+
+def test_compatibility_matrix_with_more_postings_than_cache(analyzer, tmp_path):
+    resumes = [
+        {'raw_text': "Python developer, 4 years of experience with sql and docker", 'skills': ['Python', 'SQL'],
+         'experience_years': 4},
+        {'raw_text': "Frontend engineer using react and css", 'skills': ['React', 'CSS'], 'experience_years': 2},
+    ]
+    job_descriptions = [job_description(index) for index in range(20)]
+    compute_compatibility_matrix(analyzer, resumes, job_descriptions, str(tmp_path / 'matrix'))
@@ -0,0 +1,70 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from utils.search_index import ResumeIndex
+
+SKILLS = ['python', 'machine learning', 'sql', 'docker', 'react']
+WORDS = ['data', 'pipeline', 'team', 'cloud', 'model', 'api', 'design', 'scale', 'java', 'spark',
+         'analytics', 'backend', 'frontend', 'testing', 'security', 'python', 'sql', 'docker']
+
+def random_resume(rng: random.Random) -> dict:
+    words = rng.choices(WORDS, k=rng.randint(5, 80))
+    return {'raw_text': ' '.join(words), 'skills': rng.sample(SKILLS, rng.randint(0, 3))}
+
+def exhaustive_bm25(index: ResumeIndex, documents: dict, job_description: str) -> dict:
+    """Score every indexed document against every query term"""
+    terms = {key: index.document_terms(resume_data) for key, resume_data in documents.items()}
+    lengths = {key: sum(counts.values()) for key, counts in terms.items()}
+    average_length = sum(lengths.values()) / len(lengths)
+    document_frequency = Counter(term for counts in terms.values() for term in counts)
+
+    scores = {}
+    for key, counts in terms.items():
+        score = 0.0
+        for term in index.query_terms(job_description):
+            tf = counts.get(term, 0)
+            if not tf:
+                continue
+            df = document_frequency[term]
+            idf = math.log(1 + (len(terms) - df + 0.5) / (df + 0.5))
+            score += idf * tf * (index.k1 + 1) / (
+                tf + index.k1 * (1 - index.b + index.b * lengths[key] / average_length)
+            )
+        if score > 0:
+            scores[key] = score
+    return scores
+
+def assert_matches_exhaustive(index: ResumeIndex, documents: dict, job_description: str, top_k: int) -> None:
+    expected = exhaustive_bm25(index, documents, job_description)
+    results = index.search(job_description, top_k=top_k)
+    expected_scores = sorted(expected.values(), reverse=True)[:top_k]
+
+    assert [score for _, score in results] == pytest.approx(expected_scores)
+    for key, score in results:
+        assert expected[key] == pytest.approx(score)
+
+def test_maxscore_matches_exhaustive_bm25(tmp_path):
+    rng = random.Random(7)
+    path = str(tmp_path / 'index.sqlite3')
+    index = ResumeIndex(path, skills_database=SKILLS)
+    documents = {f"resume-{i}": random_resume(rng) for i in range(300)}
+    index.add_many(documents.items())
+
+    # Deletes leave loose upper bounds behind, which pruning must tolerate
+    for key in rng.sample(sorted(documents), 40):
+        index.delete(key)
+        del documents[key]
+
+    queries = [' '.join(rng.choices(WORDS + SKILLS, k=rng.randint(1, 12))) for _ in range(50)]
+    for query in queries:
+        for top_k in (1, 5, 50):
+            assert_matches_exhaustive(index, documents, query, top_k)
+
+    # The same results after a reload from disk
+    reloaded = ResumeIndex(path, skills_database=SKILLS)
+    assert len(reloaded) == len(documents)
+    for query in queries:
+        assert_matches_exhaustive(reloaded, documents, query, 10)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from utils.analyzer import ResumeAnalyzer
+from utils.idf_model import IdfModel
+from utils.resume_parser import ResumeParser
+from utils.what_if import TermSpace, WhatIfSession, common_affixes
+from data.skills_database import get_all_skills
+
+JOB_DESCRIPTION = (
+    "Senior data engineer. 5+ years of experience building pipelines in Python and SQL. "
+    "Experience with Docker, Kubernetes and AWS; machine learning a plus. Bachelor's degree required."
+)
+SNIPPETS = [
+    'python', 'sql', 'machine learning', 'docker', 'react', 'kubernetes', 'aws', 'java', ' ', '\n', '. ',
+    'built data pipelines', 'led a team', '3 years of experience', '7+ years in', 'experience: 2 years',
+    'pyth', 'on', 'ing', 'the', 'and', 'c++', 'node.js', 'deep learning', 'scikit-learn', 'git',
+]
+
+def random_edit(rng: random.Random, text: str) -> str:
+    start = rng.randint(0, len(text))
+    end = min(len(text), start + rng.choice([0, 0, 1, 3, 10, 40]))
+    insert = ''.join(rng.choice(SNIPPETS) + rng.choice(['', ' ']) for _ in range(rng.randint(0, 3)))
+    return text[:start] + insert + text[end:]
+
+def test_common_affixes():
+    assert common_affixes('abcxyz', 'abcQxyz') == (3, 3)
+    assert common_affixes('aaa', 'aaaa') == (3, 0)
+    assert common_affixes('', 'abc') == (0, 0)
+
+def test_term_space_is_abstract():
+    with pytest.raises(TypeError):
+        TermSpace({})
+
+@pytest.mark.parametrize('similarity_engine, corpus_idf', [('hashing', False), ('tfidf', False), ('tfidf', True)])
+def test_incremental_preview_matches_full_analysis(nlp, tmp_path, similarity_engine, corpus_idf):
+    rng = random.Random(11)
+    skills_database = get_all_skills()
+    parser = ResumeParser()
+    idf_model_path = None
+    if corpus_idf:
+        corpus = [JOB_DESCRIPTION] + [' '.join(rng.choices(SNIPPETS, k=30)) for _ in range(20)]
+        idf_model_path = str(tmp_path / 'tfidf')
+        IdfModel.build(corpus).save(idf_model_path)
+    analyzer = ResumeAnalyzer(idf_model_path=idf_model_path, semantic_index_path=None,
+                              similarity_engine=similarity_engine)
+    session = WhatIfSession(analyzer, JOB_DESCRIPTION, skills_database)
+
+    text = ''
+    for _ in range(150):
+        text = random_edit(rng, text)
+        preview = session.update(text)
+
+        resume_data = parser.parse_resume(text, 'text', skills_database)
+        breakdown = analyzer.perform_full_analysis(resume_data, JOB_DESCRIPTION)['score_breakdown']
+        assert preview['overall_score'] == breakdown['overall_score']
+        assert preview['similarity_score'] == pytest.approx(breakdown['similarity_score'], abs=0.1)
+        assert preview['skill_match_percentage'] == breakdown['skill_match_percentage']
+        assert preview['experience_years'] == resume_data['experience_years']
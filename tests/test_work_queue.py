@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from utils.work_queue import LeaseHeartbeat, WorkQueue
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'queue.sqlite3')
+
+def open_queue(db_path, **options) -> WorkQueue:
+    queue = WorkQueue(db_path, **options)
+    queue.enqueue(['a.txt', 'b.txt'])
+    return queue
+
+def test_expired_lease_is_reclaimed_and_fenced(db_path):
+    queue = open_queue(db_path, lease_seconds=0.2)
+    assert queue.claim('crashed', limit=2) == ['a.txt', 'b.txt']
+    assert queue.claim('restarted', limit=2) == []
+
+    time.sleep(0.3)
+    assert queue.claim('restarted', limit=2) == ['a.txt', 'b.txt']
+    # The crashed worker's late result is refused, the new owner's is kept
+    assert not queue.renew('a.txt', 'crashed')
+    assert not queue.complete('a.txt', 'crashed', {'seconds': 1.0})
+    assert queue.complete('a.txt', 'restarted', {'seconds': 1.0})
+    assert queue.counts() == {'pending': 0, 'leased': 1, 'done': 1, 'failed': 0}
+
+def test_lease_expiring_on_last_attempt_fails_the_file(db_path):
+    queue = open_queue(db_path, lease_seconds=0.1, max_attempts=1)
+    queue.claim('crashed', limit=1)
+    time.sleep(0.2)
+    assert queue.claim('restarted', limit=2) == ['b.txt']
+    assert queue.counts()['failed'] == 1
+    assert list(queue.iter_records()) == [{'path': 'a.txt', 'error': 'lease expired'}]
+
+def test_renew_extends_the_lease(db_path):
+    queue = open_queue(db_path, lease_seconds=0.3)
+    queue.claim('worker', limit=1)
+    time.sleep(0.2)
+    assert queue.renew('a.txt', 'worker')
+    time.sleep(0.2)
+    assert queue.claim('other', limit=1) == ['b.txt']
+
+def test_failures_back_off_exponentially_until_max_attempts(db_path):
+    queue = WorkQueue(db_path, max_attempts=3, backoff_seconds=10)
+    queue.enqueue(['a.txt'])
+    for attempt in (1, 2):
+        assert queue.claim('worker', limit=1) == ['a.txt']
+        before = time.time()
+        assert queue.fail('a.txt', 'worker', 'boom')
+        available_at, = queue._conn.execute("SELECT available_at FROM tasks").fetchone()
+        # Jitter keeps the delay between half and all of backoff * 2^(attempt - 1)
+        delay = 10 * 2 ** (attempt - 1)
+        assert before + delay * 0.5 <= available_at <= time.time() + delay
+        assert queue.next_wakeup() == available_at
+        assert queue.claim('worker', limit=1) == []
+        # End the backoff now rather than sleep through it
+        queue._conn.execute("UPDATE tasks SET available_at = 0")
+
+    assert queue.claim('worker', limit=1) == ['a.txt']
+    assert queue.fail('a.txt', 'worker', 'boom')
+    assert queue.counts()['failed'] == 1
+    assert queue.next_wakeup() is None
+    assert queue.requeue_failed() == 1
+    assert queue.claim('worker', limit=1) == ['a.txt']
+
+def test_heartbeat_keeps_held_leases_alive(db_path):
+    queue = open_queue(db_path, lease_seconds=0.3)
+    paths = queue.claim('worker', limit=2)
+    heartbeat = LeaseHeartbeat(lambda: WorkQueue(db_path, lease_seconds=0.3), 'worker', 0.1).start()
+    heartbeat.hold(paths)
+    heartbeat.release('b.txt')
+    try:
+        time.sleep(0.6)
+        # a.txt is still held; b.txt was released, so its lease ran out
+        assert queue.claim('other', limit=2) == ['b.txt']
+        assert queue.complete('b.txt', 'other', {'seconds': 1.0})
+    finally:
+        heartbeat.stop()
+    time.sleep(0.4)
+    assert queue.claim('other', limit=2) == ['a.txt']
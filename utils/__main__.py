@@ -0,0 +1,115 @@
+"""Command-line entry points.
+
+Run from the repository root:
+
+    python -m utils batch --jd jd.txt --resumes ./inbox --out results.jsonl --workers 8
+
+Resumable batch jobs keep their state in a SQLite work queue; rerunning any step after a
+crash picks up where it stopped, and 'queue work' may run on several hosts at once:
+
+    python -m utils queue init --db job.sqlite3 --jd jd.txt --resumes ./inbox
+    python -m utils queue work --db job.sqlite3 --workers 8
+    python -m utils queue status --db job.sqlite3
+    python -m utils queue export --db job.sqlite3 --out results.jsonl
+"""
+import argparse
+import sys
+
+def batch(args) -> None:
+    from utils.batch import format_summary, run_batch
+
+    with open(args.jd, encoding='utf-8') as f:
+        job_description = f.read()
+    summary = run_batch(job_description, args.resumes, args.out, workers=args.workers, chunksize=args.chunksize)
+    # The summary goes to stderr so '--out -' output stays pure JSONL
+    print(format_summary(summary), file=sys.stderr)
+
+def queue_init(args) -> None:
+    from utils.work_queue import init_queue
+
+    with open(args.jd, encoding='utf-8') as f:
+        job_description = f.read()
+    added, counts = init_queue(args.db, job_description, args.resumes, shared_storage=args.shared_storage)
+    print(f"Queued {added} new file(s); {format_counts(counts)}", file=sys.stderr)
+
+def queue_work(args) -> None:
+    from utils.batch import format_summary
+    from utils.work_queue import WorkQueue, work_queue
+
+    if args.retry_failed:
+        queue = WorkQueue(args.db, shared_storage=args.shared_storage)
+        print(f"Requeued {queue.requeue_failed()} failed file(s)", file=sys.stderr)
+        queue.close()
+    summary = work_queue(args.db, workers=args.workers, chunksize=args.chunksize, lease_seconds=args.lease,
+                         max_attempts=args.max_attempts, backoff_seconds=args.backoff,
+                         shared_storage=args.shared_storage)
+    print(format_summary(summary), file=sys.stderr)
+    if summary['lost']:
+        print(f"{summary['lost']} file(s) lost their lease to another worker", file=sys.stderr)
+    print(format_counts(summary['counts']), file=sys.stderr)
+
+def queue_status(args) -> None:
+    from utils.work_queue import WorkQueue
+
+    queue = WorkQueue(args.db, shared_storage=args.shared_storage)
+    try:
+        print(format_counts(queue.counts()))
+    finally:
+        queue.close()
+
+def queue_export(args) -> None:
+    from utils.work_queue import export_results
+
+    lines = export_results(args.db, args.out, shared_storage=args.shared_storage)
+    print(f"Exported {lines} result(s)", file=sys.stderr)
+
+def format_counts(counts) -> str:
+    return ', '.join(f"{count} {status}" for status, count in counts.items())
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog='python -m utils', description="Resume analyzer command-line tools")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = commands.add_parser('batch', help="Score a folder of resumes against one job description")
+    batch_parser.add_argument('--jd', required=True, help="Job description text file")
+    batch_parser.add_argument('--resumes', required=True, help="Folder of resumes (.pdf/.docx/.txt), searched recursively")
+    batch_parser.add_argument('--out', default='-', help="JSONL output path ('-' for stdout)")
+    batch_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    batch_parser.add_argument('--chunksize', type=int, default=4, help="Files handed to a worker at a time")
+    batch_parser.set_defaults(handler=batch)
+
+    queue_parser = commands.add_parser('queue', help="Checkpointed batch jobs backed by a SQLite work queue")
+    queue_commands = queue_parser.add_subparsers(dest='queue_command', required=True)
+
+    def add_queue_command(name: str, handler, help: str) -> argparse.ArgumentParser:
+        command = queue_commands.add_parser(name, help=help)
+        command.add_argument('--db', required=True, help="Work queue database of the job")
+        command.add_argument('--shared-storage', action='store_true',
+                             help="Use the rollback journal instead of WAL, for workers on several hosts")
+        command.set_defaults(handler=handler)
+        return command
+
+    init_parser = add_queue_command('init', queue_init, "Create a job, or add files not yet queued")
+    init_parser.add_argument('--jd', required=True, help="Job description text file")
+    init_parser.add_argument('--resumes', required=True, help="Folder of resumes (.pdf/.docx/.txt), searched recursively")
+
+    work_parser = add_queue_command('work', queue_work, "Process queued files until none are left")
+    work_parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    work_parser.add_argument('--chunksize', type=int, default=4, help="Files claimed by a worker at a time")
+    work_parser.add_argument('--lease', type=float, default=60,
+                             help="Seconds before files claimed by a dead worker are handed out again; "
+                                  "live workers renew theirs every third of this")
+    work_parser.add_argument('--max-attempts', type=int, default=3, help="Attempts per file before it is marked failed")
+    work_parser.add_argument('--backoff', type=float, default=30, help="Seconds before the first retry, doubled per attempt")
+    work_parser.add_argument('--retry-failed', action='store_true', help="Give failed files a fresh set of attempts first")
+
+    add_queue_command('status', queue_status, "Show how many files are pending, leased, done and failed")
+
+    export_parser = add_queue_command('export', queue_export, "Write stored results as JSONL")
+    export_parser.add_argument('--out', default='-', help="JSONL output path ('-' for stdout)")
+
+    args = arg_parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
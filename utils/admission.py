@@ -0,0 +1,158 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# parse_resume's file_type decides the cost of a request: PDF and DOCX need text
+# extraction, plain text goes straight to analysis
+LANE_BY_FILE_TYPE = {'pdf': 'extraction', 'docx': 'extraction', 'text': 'analysis'}
+
+class Overloaded(Exception):
+    def __init__(self, lane: str, retry_after: int):
+        """Raised when a request is shed instead of queued; retry_after is in seconds"""
+        super().__init__(f"The {lane} lane is overloaded, retry in {retry_after}s")
+        self.lane = lane
+        self.retry_after = retry_after
+
+class _Waiter:
+    __slots__ = ('priority', 'sequence', 'shed')
+
+    def __init__(self, priority: int, sequence: int):
+        self.priority = priority
+        self.sequence = sequence
+        self.shed = False
+
+class Lane:
+    # Weight of the newest sample in the moving averages of wait and service time
+    SMOOTHING = 0.2
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, max_wait: float):
+        """At most concurrency requests at once; up to max_queue more wait, highest priority first.
+
+        A request that finds the queue full, or waits longer than max_wait seconds, is shed
+        with Overloaded. A full queue admits a higher-priority request by shedding the
+        lowest-priority waiter instead.
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.admitted = 0
+        self.shed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.wait_recent = 0.0
+        self.service_recent = 0.0
+        self._waiting: List[Tuple[int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain"""
+        backlog = len(self._waiting) + self.active + 1
+        return max(1, math.ceil(backlog * self.service_recent / self.concurrency))
+
+    def _overloaded(self) -> Overloaded:
+        self.shed += 1
+        return Overloaded(self.name, self.retry_after())
+
+    def _admit(self, waited: float) -> None:
+        self.active += 1
+        self.admitted += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        self.wait_recent += self.SMOOTHING * (waited - self.wait_recent)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        self._waiting = [entry for entry in self._waiting if entry[2] is not waiter]
+        heapq.heapify(self._waiting)
+        self._condition.notify_all()
+
+    def acquire(self, priority: int = 0) -> None:
+        """Block until the request may run, or raise Overloaded"""
+        start = time.monotonic()
+        with self._condition:
+            if self.active < self.concurrency and not self._waiting:
+                self._admit(0.0)
+                return
+
+            if len(self._waiting) >= self.max_queue:
+                # Shed whoever is least important: the newest of the lowest-priority waiters, or us
+                if not self._waiting:
+                    # max_queue is 0: nothing may wait
+                    raise self._overloaded()
+                lowest = min(self._waiting, key=lambda entry: (entry[2].priority, -entry[2].sequence))[2]
+                if lowest.priority >= priority:
+                    raise self._overloaded()
+                lowest.shed = True
+                self._remove(lowest)
+
+            waiter = _Waiter(priority, next(self._sequence))
+            heapq.heappush(self._waiting, (-priority, waiter.sequence, waiter))
+            deadline = start + self.max_wait
+            while True:
+                if waiter.shed:
+                    raise self._overloaded()
+                if self._waiting[0][2] is waiter and self.active < self.concurrency:
+                    heapq.heappop(self._waiting)
+                    self._admit(time.monotonic() - start)
+                    # Capacity may remain for the next waiter
+                    self._condition.notify_all()
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._remove(waiter)
+                    raise self._overloaded()
+                self._condition.wait(remaining)
+
+    def release(self, service_seconds: float) -> None:
+        with self._condition:
+            self.active -= 1
+            self.service_recent += self.SMOOTHING * (service_seconds - self.service_recent)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = 0) -> Iterator[None]:
+        """Hold one of the lane's slots for the duration of the block"""
+        self.acquire(priority)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, load and wait times of the lane"""
+        with self._condition:
+            return {
+                'concurrency': self.concurrency,
+                'active': self.active,
+                'queue_depth': len(self._waiting),
+                'max_queue': self.max_queue,
+                'admitted': self.admitted,
+                'shed': self.shed,
+                'wait_avg_seconds': round(self.wait_total / self.admitted, 4) if self.admitted else 0.0,
+                'wait_recent_seconds': round(self.wait_recent, 4),
+                'wait_max_seconds': round(self.wait_max, 4),
+                'service_recent_seconds': round(self.service_recent, 4)
+            }
+
+class AdmissionController:
+    def __init__(self, extraction_concurrency: int = 2, analysis_concurrency: int = 4,
+                 max_queue: int = 32, max_wait: float = 5.0):
+        """Separate lanes for document extraction and text analysis, so PDF bursts cannot starve text requests"""
+        self.lanes = {
+            'extraction': Lane('extraction', extraction_concurrency, max_queue, max_wait),
+            'analysis': Lane('analysis', analysis_concurrency, max_queue, max_wait),
+        }
+
+    def lane_for(self, file_type: Optional[str] = None) -> Lane:
+        """The lane that parses a file of this type; analysis when no file is involved"""
+        return self.lanes[LANE_BY_FILE_TYPE.get(file_type, 'analysis')]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: lane.stats() for name, lane in self.lanes.items()}
@@ -1,91 +1,208 @@
+import copy
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import re
-from typing import Dict, List, Tuple
-import spacy
+from typing import Dict, List, Optional, Tuple, Union
+
+from utils.document import Document
+from utils.idf_model import DEFAULT_MODEL_PATH, TFIDF_PARAMS, load_idf_model
+from utils.nlp_registry import NER_PIPES, get_nlp
+from utils.semantic_index import DEFAULT_INDEX_PATH as DEFAULT_SEMANTIC_INDEX_PATH, load_semantic_index
+from utils.requirements_cache import RequirementsCache
+from utils.skill_bitset import SkillIndex, skill_match_counts
+from data.skills_database import get_all_skills
+
+# Bump whenever a change alters extract_keywords_from_job_description output
+ANALYZER_VERSION = "3"
+
+# Technical skills patterns
+TECHNICAL_PATTERNS = [re.compile(pattern) for pattern in [
+    r'\b(?:python|java|javascript|react|angular|vue|node\.js|django|flask|spring|\.net)\b',
+    r'\b(?:aws|azure|gcp|docker|kubernetes|git|sql|nosql|mongodb|postgresql)\b',
+    r'\b(?:machine learning|deep learning|ai|ml|nlp|tensorflow|pytorch|scikit-learn)\b',
+    r'\b(?:html|css|bootstrap|tailwind|scss|sass)\b'
+]]
+
+# Experience requirements
+JOB_EXPERIENCE_PATTERNS = [re.compile(pattern) for pattern in [
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+    r'minimum\s*(\d+)\s*years?',
+    r'at least\s*(\d+)\s*years?'
+]]
+
+# Education requirements
+JOB_EDUCATION_PATTERNS = [re.compile(pattern) for pattern in [
+    r'bachelor[\'s]?\s*degree',
+    r'master[\'s]?\s*degree',
+    r'phd|doctorate',
+    r'computer science|engineering|mathematics|statistics'
+]]
+
+# Weights of the overall compatibility score components (sum to 100)
+SCORE_WEIGHTS = {
+    'similarity': 40,
+    'skills': 35,
+    'experience': 15,
+    'education': 10
+}
+
+# Engines available for calculate_similarity_score
+SIMILARITY_ENGINES = ('tfidf', 'hashing')
 
 class ResumeAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.vectorizer = TfidfVectorizer(
+    def __init__(self, idf_model_path: Optional[str] = DEFAULT_MODEL_PATH, similarity_engine: str = 'tfidf',
+                 hashing_features: int = 2 ** 18, hashing_ngram_range: Tuple[int, int] = (1, 2),
+                 requirements_cache: Optional[RequirementsCache] = None, skill_index: Optional[SkillIndex] = None,
+                 semantic_index_path: Optional[str] = DEFAULT_SEMANTIC_INDEX_PATH):
+        # Per-request vectorizers are built from these settings, never shared, so concurrent
+        # sessions can analyze through one cached analyzer without locking
+        self.vectorizer_params = dict(max_features=1000, **TFIDF_PARAMS)
+        # Pre-fit corpus IDF (see utils/idf_model.py); without it, IDF is fitted per request
+        self.idf_model = load_idf_model(idf_model_path)
+        # Optional LSA index (see utils/semantic_index.py), reported next to the lexical similarity
+        self.semantic_index = load_semantic_index(semantic_index_path)
+        
+        if similarity_engine not in SIMILARITY_ENGINES:
+            raise ValueError(f"Unknown similarity engine '{similarity_engine}', expected one of {SIMILARITY_ENGINES}")
+        self.similarity_engine = similarity_engine
+        # Feature hashing needs no vocabulary or fit, so one stateless instance serves every request
+        self.hashing_vectorizer = HashingVectorizer(
+            n_features=hashing_features,
+            ngram_range=hashing_ngram_range,
             stop_words='english',
-            max_features=1000,
-            ngram_range=(1, 2)
+            alternate_sign=False,
+            norm='l2'
         )
+        
+        # Skill sets are matched as bitsets over the skills database
+        self.skill_index = skill_index if skill_index is not None else SkillIndex(get_all_skills())
+        
+        # Job requirements are memoized per posting; the key covers the IDF model they depend on
+        self.requirements_cache = requirements_cache if requirements_cache is not None else RequirementsCache()
+        idf_version = self.idf_model.fingerprint if self.idf_model is not None else 'fit'
+        self.requirements_version = f"{ANALYZER_VERSION}:{idf_version}"
+        # Everything besides the two texts that shapes the similarity scores
+        semantic_version = self.semantic_index.fingerprint if self.semantic_index is not None else 'none'
+        self.similarity_version = (f"{similarity_engine}:{hashing_features}:{hashing_ngram_range[0]}-"
+                                   f"{hashing_ngram_range[1]}:{idf_version}:{semantic_version}")
+    
+    def new_vectorizer(self) -> TfidfVectorizer:
+        """Return a fresh, unfitted TF-IDF vectorizer owned by the caller"""
+        return TfidfVectorizer(**self.vectorizer_params)
+    
+    @property
+    def nlp(self):
+        """Shared NER-only spaCy model, loaded on first use"""
+        return get_nlp(NER_PIPES)
     
-    def preprocess_text(self, text: str) -> str:
+    def preprocess_text(self, text: Union[str, Document]) -> str:
         """Clean and preprocess text for analysis"""
-        # Remove extra whitespace and normalize
-        text = re.sub(r'\s+', ' ', text.strip())
-        # Remove special characters but keep important ones
-        text = re.sub(r'[^\w\s\+\#\-\.]', ' ', text)
-        return text.lower()
-    
-    def extract_keywords_from_job_description(self, job_description: str) -> Dict[str, List[str]]:
-        """Extract key requirements from job description"""
-        doc = self.nlp(job_description)
-        
-        # Technical skills patterns
-        technical_patterns = [
-            r'\b(?:python|java|javascript|react|angular|vue|node\.js|django|flask|spring|\.net)\b',
-            r'\b(?:aws|azure|gcp|docker|kubernetes|git|sql|nosql|mongodb|postgresql)\b',
-            r'\b(?:machine learning|deep learning|ai|ml|nlp|tensorflow|pytorch|scikit-learn)\b',
-            r'\b(?:html|css|bootstrap|tailwind|scss|sass)\b'
-        ]
-        
-        # Experience requirements
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'minimum\s*(\d+)\s*years?',
-            r'at least\s*(\d+)\s*years?'
-        ]
+        # Whitespace-normalized, lowercased text without special characters, computed
+        # once per Document and shared by keyword extraction and similarity
+        return Document.of(text).preprocessed
+    
+    def extract_keywords_from_job_description(self, job_description: Union[str, Document],
+                                              doc=None) -> Dict[str, List[str]]:
+        """Extract key requirements from job description, reusing an already processed spaCy doc if given"""
+        # Requirements come from the whitespace-normalized text the cache key stands for;
+        # its preprocessed view is the one similarity scoring reads, so they share it
+        document = Document.of(job_description)
+        if doc is None:
+            doc = self.nlp(document.normalized)
         
-        # Education requirements
-        education_patterns = [
-            r'bachelor[\'s]?\s*degree',
-            r'master[\'s]?\s*degree',
-            r'phd|doctorate',
-            r'computer science|engineering|mathematics|statistics'
-        ]
+        job_description_lower = document.normalized.lower()
         
         technical_skills = []
-        for pattern in technical_patterns:
-            matches = re.findall(pattern, job_description.lower())
-            technical_skills.extend(matches)
+        for pattern in TECHNICAL_PATTERNS:
+            technical_skills.extend(pattern.findall(job_description_lower))
         
         experience_years = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, job_description.lower())
-            experience_years.extend([int(year) for year in matches])
+        for pattern in JOB_EXPERIENCE_PATTERNS:
+            experience_years.extend([int(year) for year in pattern.findall(job_description_lower)])
         
         education_requirements = []
-        for pattern in education_patterns:
-            matches = re.findall(pattern, job_description.lower())
-            education_requirements.extend(matches)
+        for pattern in JOB_EDUCATION_PATTERNS:
+            education_requirements.extend(pattern.findall(job_description_lower))
         
         # Extract entities using spaCy
-        entities = []
-        for ent in doc.ents:
-            if ent.label_ in ['ORG', 'PRODUCT', 'GPE']:  # Organizations, products, locations
-                entities.append(ent.text)
+        entities = self.entities_from_doc(doc)
         
         return {
             'technical_skills': list(set(technical_skills)),
             'experience_years': max(experience_years) if experience_years else 0,
             'education_requirements': list(set(education_requirements)),
             'entities': entities,
-            'all_keywords': self.extract_important_keywords(job_description)
+            'all_keywords': self.extract_important_keywords(document)
         }
     
-    def extract_important_keywords(self, text: str) -> List[str]:
+    def entities_from_doc(self, doc) -> List[str]:
+        """Entities of interest from a processed spaCy doc"""
+        entities = []
+        for ent in doc.ents:
+            if ent.label_ in ['ORG', 'PRODUCT', 'GPE']:  # Organizations, products, locations
+                entities.append(ent.text)
+        return entities
+    
+    def extract_entities_batch(self, texts: List[str], batch_size: int = 64, n_process: int = 1) -> List[List[str]]:
+        """Entities for many job descriptions or resumes via nlp.pipe, aligned to the input order"""
+        return [
+            self.entities_from_doc(doc)
+            for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        ]
+    
+    def get_job_requirements_batch(self, job_descriptions: List[Union[str, Document]], batch_size: int = 64,
+                                   n_process: int = 1) -> List[Dict]:
+        """get_job_requirements for many postings; uncached ones go through nlp.pipe together"""
+        documents = [Document.of(job_description) for job_description in job_descriptions]
+        keys = [self.requirements_cache.make_key(document, self.requirements_version) for document in documents]
+        results = [self.requirements_cache.get(key) for key in keys]
+        
+        # Deduplicate misses so repeated postings are processed once
+        pending = {}
+        for index, result in enumerate(results):
+            if result is None:
+                pending.setdefault(keys[index], index)
+        # Extract from the normalized text the key stands for, so every posting sharing a key
+        # gets the same requirements
+        texts = [documents[index].normalized for index in pending.values()]
+        docs = self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process)
+        # Fresh results are kept here, since a batch larger than the cache evicts its own entries
+        computed = {}
+        for (key, index), doc in zip(pending.items(), docs):
+            job_requirements = self.extract_keywords_from_job_description(documents[index], doc=doc)
+            self.requirements_cache.put(key, job_requirements)
+            computed[key] = job_requirements
+        
+        return [result if result is not None else copy.deepcopy(computed[key])
+                for key, result in zip(keys, results)]
+    
+    def get_job_requirements(self, job_description: Union[str, Document]) -> Dict:
+        """Return job requirements, extracting them only once per distinct job description"""
+        document = Document.of(job_description)
+        key = self.requirements_cache.make_key(document, self.requirements_version)
+        job_requirements = self.requirements_cache.get(key)
+        if job_requirements is None:
+            job_requirements = self.extract_keywords_from_job_description(document)
+            self.requirements_cache.put(key, job_requirements)
+        return job_requirements
+    
+    def extract_important_keywords(self, text: Union[str, Document]) -> List[str]:
         """Extract important keywords using TF-IDF"""
         # Preprocess text
         processed_text = self.preprocess_text(text)
         
         # Get TF-IDF scores
-        tfidf_matrix = self.vectorizer.fit_transform([processed_text])
-        feature_names = self.vectorizer.get_feature_names_out()
+        if self.idf_model is not None:
+            row = self.idf_model.transform([processed_text])
+            feature_names = self.idf_model.feature_names
+            # Only non-zero weights can rank; order ties by feature index as the dense sort did
+            keyword_scores = sorted(zip(row.indices, row.data), key=lambda x: (-x[1], x[0]))
+            return [feature_names[index] for index, score in keyword_scores[:20] if score > 0]
+        
+        vectorizer = self.new_vectorizer()
+        tfidf_matrix = vectorizer.fit_transform([processed_text])
+        feature_names = vectorizer.get_feature_names_out()
         scores = tfidf_matrix.toarray()[0]
         
         # Get top keywords
@@ -95,48 +212,66 @@ class ResumeAnalyzer:
         # Return top 20 keywords
         return [keyword for keyword, score in keyword_scores[:20] if score > 0]
     
-    def calculate_similarity_score(self, resume_text: str, job_description: str) -> float:
+    def calculate_similarity_score(self, resume_text: Union[str, Document],
+                                   job_description: Union[str, Document]) -> float:
         """Calculate similarity between resume and job description using TF-IDF and cosine similarity"""
         # Preprocess texts
         resume_processed = self.preprocess_text(resume_text)
         job_processed = self.preprocess_text(job_description)
         
-        # Calculate TF-IDF vectors
-        tfidf_matrix = self.vectorizer.fit_transform([resume_processed, job_processed])
+        # Calculate TF-IDF (or hashed term) vectors
+        tfidf_matrix = self.vectorize_texts([resume_processed, job_processed])
         
         # Calculate cosine similarity
         similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
         
         return similarity
     
+    def calculate_semantic_similarity(self, resume_text: Union[str, Document],
+                                      job_description: Union[str, Document]) -> Optional[float]:
+        """Cosine similarity in LSA space, or None when no semantic index has been built"""
+        if self.semantic_index is None:
+            return None
+        return self.semantic_index.similarity(
+            self.preprocess_text(resume_text), self.preprocess_text(job_description)
+        )
+    
     def analyze_skill_match(self, resume_skills: List[str], job_requirements: Dict) -> Dict[str, List[str]]:
         """Analyze skill matching between resume and job requirements"""
         required_skills = job_requirements['technical_skills'] + job_requirements['all_keywords']
-        required_skills_lower = [skill.lower() for skill in required_skills]
-        resume_skills_lower = [skill.lower() for skill in resume_skills]
-        
-        # Find matches
-        matched_skills = []
-        for skill in resume_skills:
-            if skill.lower() in required_skills_lower:
-                matched_skills.append(skill)
-        
-        # Find missing skills
-        missing_skills = []
-        for skill in required_skills:
-            if skill.lower() not in resume_skills_lower:
-                missing_skills.append(skill)
-        
-        # Find additional skills (in resume but not required)
-        additional_skills = []
-        for skill in resume_skills:
-            if skill.lower() not in required_skills_lower:
-                additional_skills.append(skill)
         
+        # Known skills become bitsets over the skills database; the rest (mostly TF-IDF
+        # keywords) stay as small sets of lowercased strings
+        resume_bits, resume_unknown = self.skill_index.encode(resume_skills)
+        required_bits, required_unknown = self.skill_index.encode(required_skills)
+        
+        def in_resume(skill):
+            return self.skill_index.contains(resume_bits, skill) or skill.lower() in resume_unknown
+        
+        def is_required(skill):
+            return self.skill_index.contains(required_bits, skill) or skill.lower() in required_unknown
+        
+        # Materialize the string lists from the bitsets, keeping the original spellings
         return {
-            'matched_skills': list(set(matched_skills)),
-            'missing_skills': list(set(missing_skills)),
-            'additional_skills': list(set(additional_skills))
+            'matched_skills': list({skill for skill in resume_skills if is_required(skill)}),
+            'missing_skills': list({skill for skill in required_skills if not in_resume(skill)}),
+            'additional_skills': list({skill for skill in resume_skills if not is_required(skill)})
+        }
+    
+    def count_skill_matches(self, resumes: List[Dict], job_requirements: Dict) -> Dict[str, np.ndarray]:
+        """Matched, missing and additional skill counts for many resumes, without building string lists"""
+        required_skills = job_requirements['technical_skills'] + job_requirements['all_keywords']
+        required_bits, required_unknown = self.skill_index.encode(required_skills)
+        resume_bits, resume_unknown = self.skill_index.encode_many([resume['skills'] for resume in resumes])
+        
+        counts = skill_match_counts(resume_bits, required_bits)
+        # Skills outside the database are rare on the resume side, so plain set math is enough
+        unknown_matched = np.array([len(unknown & required_unknown) for unknown in resume_unknown], dtype=np.int64)
+        unknown_additional = np.array([len(unknown) for unknown in resume_unknown], dtype=np.int64) - unknown_matched
+        return {
+            'matched': counts['matched'] + unknown_matched,
+            'missing': counts['missing'] + len(required_unknown) - unknown_matched,
+            'additional': counts['additional'] + unknown_additional
         }
     
     def calculate_overall_score(self, resume_data: Dict, job_requirements: Dict, 
@@ -145,16 +280,16 @@ class ResumeAnalyzer:
         score_components = []
         
         # Similarity score (40% weight)
-        similarity_component = similarity_score * 40
+        similarity_component = similarity_score * SCORE_WEIGHTS['similarity']
         score_components.append(similarity_component)
         
         # Skill matching (35% weight)
         total_required_skills = len(job_requirements['technical_skills'])
         if total_required_skills > 0:
             skill_match_ratio = len(skill_analysis['matched_skills']) / total_required_skills
-            skill_component = skill_match_ratio * 35
+            skill_component = skill_match_ratio * SCORE_WEIGHTS['skills']
         else:
-            skill_component = 35  # If no specific skills required
+            skill_component = SCORE_WEIGHTS['skills']  # If no specific skills required
         score_components.append(skill_component)
         
         # Experience matching (15% weight)
@@ -162,19 +297,101 @@ class ResumeAnalyzer:
         candidate_experience = resume_data['experience_years']
         if required_experience > 0:
             experience_ratio = min(candidate_experience / required_experience, 1.0)
-            experience_component = experience_ratio * 15
+            experience_component = experience_ratio * SCORE_WEIGHTS['experience']
         else:
-            experience_component = 15
+            experience_component = SCORE_WEIGHTS['experience']
         score_components.append(experience_component)
         
         # Education and other factors (10% weight)
-        education_component = 10  # Simplified for now
+        education_component = SCORE_WEIGHTS['education']  # Simplified for now
         score_components.append(education_component)
         
         # Calculate final score
         final_score = sum(score_components)
         return min(int(final_score), 100)  # Cap at 100
     
+    def calculate_overall_scores(self, similarity_scores: np.ndarray, matched_skill_counts: np.ndarray,
+                                 candidate_experience: np.ndarray, total_required_skills,
+                                 required_experience) -> np.ndarray:
+        """Vectorized calculate_overall_score; returns uncapped float totals.
+
+        Arguments broadcast against each other, so per-job values may be scalars (one job)
+        or row vectors (a block of resumes against many jobs).
+        """
+        # Similarity score (40% weight)
+        final_scores = similarity_scores * SCORE_WEIGHTS['similarity']
+        
+        # Skill matching (35% weight); full marks if no specific skills required
+        total_required_skills = np.asarray(total_required_skills, dtype=float)
+        skill_ratio = matched_skill_counts / np.maximum(total_required_skills, 1)
+        final_scores = final_scores + np.where(
+            total_required_skills > 0, skill_ratio * SCORE_WEIGHTS['skills'], SCORE_WEIGHTS['skills']
+        )
+        
+        # Experience matching (15% weight)
+        required_experience = np.asarray(required_experience, dtype=float)
+        experience_ratio = np.minimum(candidate_experience / np.maximum(required_experience, 1), 1.0)
+        final_scores = final_scores + np.where(
+            required_experience > 0, experience_ratio * SCORE_WEIGHTS['experience'], SCORE_WEIGHTS['experience']
+        )
+        
+        # Education and other factors (10% weight)
+        return final_scores + SCORE_WEIGHTS['education']
+    
+    def vectorize_texts(self, texts: List[str]):
+        """Return L2-normalized term vectors for preprocessed texts using the configured engine"""
+        if self.similarity_engine == 'hashing':
+            return self.hashing_vectorizer.transform(texts)
+        if self.idf_model is not None:
+            return self.idf_model.transform(texts)
+        # Without a corpus model, IDF is fitted on the texts being compared
+        return self.new_vectorizer().fit_transform(texts)
+    
+    def rank_resumes(self, resumes: List[Dict], job_description: str, top_k: Optional[int] = 10) -> List[Dict]:
+        """Score many parsed resumes against one job description in a single vectorized pass.
+
+        Returns the top_k resumes (all of them when top_k is None), best first, as dicts with
+        the resume's 'index' in the input list, 'overall_score' (0-100), 'similarity_score'
+        and 'matched_skills_count'.
+        """
+        if top_k is not None and top_k < 0:
+            raise ValueError(f"top_k must be non-negative, got {top_k}")
+        if not resumes or top_k == 0:
+            return []
+        job_requirements = self.get_job_requirements(job_description)
+        
+        # One sparse matrix: row 0 is the job description, the rest are resumes
+        matrix = self.vectorize_texts(
+            [self.preprocess_text(job_description)] +
+            [self.preprocess_text(resume['raw_text']) for resume in resumes]
+        )
+        # Rows are L2-normalized, so one sparse matrix-vector product gives every cosine similarity
+        similarity_scores = np.asarray((matrix[1:] @ matrix[0].T).todense()).ravel()
+        
+        # Skill matches (bitset AND plus popcount) and experience, as NumPy arrays
+        matched_skill_counts = self.count_skill_matches(resumes, job_requirements)['matched'].astype(float)
+        candidate_experience = np.array([resume['experience_years'] for resume in resumes], dtype=float)
+        
+        final_scores = self.calculate_overall_scores(
+            similarity_scores, matched_skill_counts, candidate_experience,
+            len(job_requirements['technical_skills']), job_requirements['experience_years']
+        )
+        
+        # Partial selection of the top k, then sort only those
+        top_k = len(resumes) if top_k is None else min(top_k, len(resumes))
+        top_indices = np.argpartition(-final_scores, top_k - 1)[:top_k]
+        top_indices = top_indices[np.lexsort((top_indices, -final_scores[top_indices]))]
+        
+        return [
+            {
+                'index': int(index),
+                'overall_score': min(int(final_scores[index]), 100),
+                'similarity_score': float(similarity_scores[index]),
+                'matched_skills_count': int(matched_skill_counts[index])
+            }
+            for index in top_indices
+        ]
+    
     def generate_score_breakdown(self, resume_data: Dict, job_requirements: Dict, 
                                skill_analysis: Dict, similarity_score: float) -> Dict:
         """Generate detailed score breakdown"""
@@ -206,13 +423,22 @@ class ResumeAnalyzer:
         
         return breakdown
     
-    def perform_full_analysis(self, resume_data: Dict, job_description: str) -> Dict:
-        """Perform complete analysis and return all results"""
-        # Extract job requirements
-        job_requirements = self.extract_keywords_from_job_description(job_description)
+    def perform_full_analysis(self, resume_data: Dict, job_description: Union[str, Document],
+                              resume_document: Optional[Document] = None) -> Dict:
+        """Perform complete analysis and return all results.
+
+        Pass the Document the resume was parsed from (ResumeParser.parse_resume_document) and
+        one Document per job description, so their views are computed once per text.
+        """
+        if resume_document is None:
+            resume_document = Document(resume_data['raw_text'])
+        job_document = Document.of(job_description)
+        
+        # Extract job requirements (memoized per job description)
+        job_requirements = self.get_job_requirements(job_document)
         
         # Calculate similarity
-        similarity_score = self.calculate_similarity_score(resume_data['raw_text'], job_description)
+        similarity_score = self.calculate_similarity_score(resume_document, job_document)
         
         # Analyze skills
         skill_analysis = self.analyze_skill_match(resume_data['skills'], job_requirements)
@@ -222,9 +448,16 @@ class ResumeAnalyzer:
             resume_data, job_requirements, skill_analysis, similarity_score
         )
         
-        return {
+        results = {
             'job_requirements': job_requirements,
             'skill_analysis': skill_analysis,
             'score_breakdown': score_breakdown,
             'similarity_score': similarity_score
-        }
\ No newline at end of file
+        }
+        
+        # Semantic similarity is informational and does not feed the overall score
+        semantic_similarity = self.calculate_semantic_similarity(resume_document, job_document)
+        if semantic_similarity is not None:
+            results['semantic_similarity'] = semantic_similarity
+        
+        return results
\ No newline at end of file
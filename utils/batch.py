@@ -0,0 +1,138 @@
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
+
+from utils.document import Document
+from utils.pipeline import AnalysisPipeline, build_pipeline
+from utils.resume_parser import iter_chunk_results, iter_resume_files, read_resume_file
+
+# Per-process state of the batch workers
+_pipeline: Optional[AnalysisPipeline] = None
+_job_description: Optional[Document] = None
+
+def _init_worker(job_description: str) -> None:
+    """Load the models once per worker process"""
+    global _pipeline, _job_description
+    _pipeline = build_pipeline()
+    # One Document for the whole run, so the job description is preprocessed once per worker
+    _job_description = Document(job_description)
+
+def analyze_file(pipeline: AnalysisPipeline, path: str, job_description: Union[str, Document]) -> Dict:
+    """Parse, analyze and recommend one resume file, reporting failures instead of raising.
+
+    The record leaves out the resume's raw_text so output lines stay small.
+    """
+    start = time.perf_counter()
+    try:
+        content, file_type = read_resume_file(path)
+        resume_data, resume_document = pipeline.parser.parse_resume_document(
+            content, file_type, pipeline.skills_database
+        )
+        analysis = pipeline.analyzer.perform_full_analysis(resume_data, job_description, resume_document)
+        recommendations = pipeline.recommender.generate_comprehensive_recommendations(
+            resume_data, analysis['job_requirements'], analysis['skill_analysis'], analysis['score_breakdown'],
+            resume_document
+        )
+    except Exception as e:
+        return {'path': path, 'error': str(e), 'seconds': time.perf_counter() - start}
+
+    return {
+        'path': path,
+        'error': None,
+        'seconds': time.perf_counter() - start,
+        'overall_score': analysis['score_breakdown']['overall_score'],
+        'resume_data': {key: value for key, value in resume_data.items() if key != 'raw_text'},
+        'analysis': analysis,
+        'recommendations': recommendations
+    }
+
+def _analyze_chunk(paths: List[str]) -> List[Dict]:
+    return [analyze_file(_pipeline, path, _job_description) for path in paths]
+
+class LatencySummary:
+    def __init__(self, sample_size: int = 10000):
+        """Count, mean and percentiles of per-file latency in constant memory (reservoir sample)"""
+        self.sample_size = sample_size
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self._sample: List[float] = []
+        self._random = random.Random(0)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        if len(self._sample) < self.sample_size:
+            self._sample.append(seconds)
+        else:
+            index = self._random.randrange(self.count)
+            if index < self.sample_size:
+                self._sample[index] = seconds
+
+    def percentile(self, q: float) -> float:
+        if not self._sample:
+            return 0.0
+        ordered = sorted(self._sample)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.maximum
+        }
+
+def run_batch(job_description: str, resumes: Union[str, Iterable[str]], out_path: str,
+              workers: Optional[int] = None, chunksize: int = 4) -> Dict:
+    """Score every resume file against one job description, streaming one JSON line per resume.
+
+    Lines are written, in completion order, as soon as each chunk of files finishes;
+    out_path '-' writes to stdout. Returns the throughput and latency summary.
+    """
+    workers = workers or os.cpu_count() or 1
+    latency = LatencySummary()
+    succeeded = failed = 0
+    start = time.perf_counter()
+
+    out = sys.stdout if out_path == '-' else open(out_path, 'w', encoding='utf-8')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(job_description,)) as executor:
+            for record in iter_chunk_results(executor, _analyze_chunk, iter_resume_files(resumes),
+                                             chunksize, workers * 2):
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                latency.add(record['seconds'])
+                if record['error'] is None:
+                    succeeded += 1
+                else:
+                    failed += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'files': succeeded + failed,
+        'succeeded': succeeded,
+        'failed': failed,
+        'elapsed_seconds': elapsed,
+        'files_per_second': (succeeded + failed) / elapsed if elapsed else 0.0,
+        'latency_seconds': latency.summary()
+    }
+
+def format_summary(summary: Dict) -> str:
+    latency = summary['latency_seconds']
+    return (
+        f"{summary['files']} files ({summary['succeeded']} ok, {summary['failed']} failed) "
+        f"in {summary['elapsed_seconds']:.1f}s, {summary['files_per_second']:.1f} files/s\n"
+        f"latency per file: mean {latency['mean'] * 1000:.0f} ms, p50 {latency['p50'] * 1000:.0f} ms, "
+        f"p95 {latency['p95'] * 1000:.0f} ms, p99 {latency['p99'] * 1000:.0f} ms, max {latency['max'] * 1000:.0f} ms"
+    )
@@ -0,0 +1,102 @@
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+from scipy import sparse
+
+from utils.analyzer import ResumeAnalyzer
+
+INDICES_FILE = 'top_jobs.npy'
+SCORES_FILE = 'top_scores.npy'
+META_FILE = 'meta.json'
+
+def skill_matrix(skill_lists: List[List[str]], columns: Dict[str, int], dedupe_lower: bool) -> sparse.csr_matrix:
+    """Sparse rows of lowercased-skill counts, adding new skills to the shared column index"""
+    rows, cols = [], []
+    for row, skills in enumerate(skill_lists):
+        distinct = {skill.lower() for skill in skills} if dedupe_lower else set(skills)
+        for skill in distinct:
+            rows.append(row)
+            cols.append(columns.setdefault(skill.lower(), len(columns)))
+    data = np.ones(len(rows))
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(skill_lists), len(columns)))
+
+def compute_compatibility_matrix(analyzer: ResumeAnalyzer, resumes: List[Dict], job_descriptions: List[str],
+                                 out_dir: str, top_k: int = 50, block_size: int = 1024, n_process: int = 1) -> Dict:
+    """Score every resume against every job description in memory-bounded blocks.
+
+    Uses the same components and weights as ResumeAnalyzer.calculate_overall_score. Each
+    block of resumes is scored against all jobs with sparse matrix products and reduced to
+    its top_k jobs, which are written straight into memory-mapped .npy files in out_dir:
+    top_jobs.npy (int32 job indices, best first) and top_scores.npy (float32 scores on the
+    0-100 overall_score scale, before truncation to an integer).
+    """
+    n_resumes, n_jobs = len(resumes), len(job_descriptions)
+    if not n_resumes or not n_jobs:
+        raise ValueError("At least one resume and one job description are required")
+    top_k = min(top_k, n_jobs)
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Job side: requirements are memoized per posting, uncached ones parsed with nlp.pipe
+    job_requirements = analyzer.get_job_requirements_batch(job_descriptions, n_process=n_process)
+    total_required_skills = np.array([len(requirements['technical_skills']) for requirements in job_requirements])
+    required_experience = np.array([requirements['experience_years'] for requirements in job_requirements])
+
+    # One vector space for both sides; the fit fallback fits IDF once over all documents
+    matrix = analyzer.vectorize_texts(
+        [analyzer.preprocess_text(job_description) for job_description in job_descriptions] +
+        [analyzer.preprocess_text(resume['raw_text']) for resume in resumes]
+    ).tocsr()
+    job_vectors, resume_vectors = matrix[:n_jobs], matrix[n_jobs:]
+    job_vectors_t = job_vectors.T.tocsc()
+
+    # Matched-skill counts as a sparse product: distinct resume skills times required-skill indicators
+    columns: Dict[str, int] = {}
+    required_skills = skill_matrix(
+        [requirements['technical_skills'] + requirements['all_keywords'] for requirements in job_requirements],
+        columns, dedupe_lower=True
+    )
+    resume_skills = skill_matrix([resume['skills'] for resume in resumes], columns, dedupe_lower=False)
+    required_skills.resize((n_jobs, len(columns)))
+    required_skills_t = required_skills.T.tocsc()
+    candidate_experience = np.array([resume['experience_years'] for resume in resumes], dtype=float)
+
+    top_jobs = np.lib.format.open_memmap(
+        os.path.join(out_dir, INDICES_FILE), mode='w+', dtype=np.int32, shape=(n_resumes, top_k)
+    )
+    top_scores = np.lib.format.open_memmap(
+        os.path.join(out_dir, SCORES_FILE), mode='w+', dtype=np.float32, shape=(n_resumes, top_k)
+    )
+
+    for start in range(0, n_resumes, block_size):
+        stop = min(start + block_size, n_resumes)
+        similarity_scores = (resume_vectors[start:stop] @ job_vectors_t).toarray()
+        matched_skill_counts = (resume_skills[start:stop] @ required_skills_t).toarray()
+        scores = analyzer.calculate_overall_scores(
+            similarity_scores, matched_skill_counts, candidate_experience[start:stop, None],
+            total_required_skills[None, :], required_experience[None, :]
+        )
+
+        # Partial selection per row, then order only the kept columns
+        if top_k < n_jobs:
+            kept = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            kept = np.tile(np.arange(n_jobs), (stop - start, 1))
+        kept_scores = np.take_along_axis(scores, kept, axis=1)
+        order = np.argsort(-kept_scores, axis=1, kind='stable')
+        top_jobs[start:stop] = np.take_along_axis(kept, order, axis=1)
+        top_scores[start:stop] = np.minimum(np.take_along_axis(kept_scores, order, axis=1), 100)
+
+    top_jobs.flush()
+    top_scores.flush()
+    meta = {'resumes': n_resumes, 'jobs': n_jobs, 'top_k': top_k, 'block_size': block_size}
+    with open(os.path.join(out_dir, META_FILE), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    return meta
+
+def load_compatibility_matrix(out_dir: str):
+    """Return memory-mapped (top_jobs, top_scores) arrays written by compute_compatibility_matrix"""
+    top_jobs = np.load(os.path.join(out_dir, INDICES_FILE), mmap_mode='r')
+    top_scores = np.load(os.path.join(out_dir, SCORES_FILE), mmap_mode='r')
+    return top_jobs, top_scores
@@ -0,0 +1,44 @@
+import re
+from functools import cached_property
+from typing import List
+
+_WHITESPACE = re.compile(r'\s+')
+_SPECIAL_CHARACTERS = re.compile(r'[^\w\s\+\#\-\.]')
+
+class Document:
+    def __init__(self, text: str):
+        """Text with lazily computed, cached views; build one per request and pass it down"""
+        self.text = text
+
+    @staticmethod
+    def of(text) -> 'Document':
+        """Return the Document itself, or wrap a plain string in a new one"""
+        if isinstance(text, Document):
+            return text
+        return Document(text)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def normalized(self) -> str:
+        """Stripped, with every whitespace run collapsed to one space"""
+        return _WHITESPACE.sub(' ', self.text.strip())
+
+    @cached_property
+    def preprocessed(self) -> str:
+        """Normalized, lowercased text with special characters (except + # - .) removed"""
+        return _SPECIAL_CHARACTERS.sub(' ', self.normalized).lower()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return self.text.split()
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.tokens)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.text.split('\n')
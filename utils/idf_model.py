@@ -0,0 +1,110 @@
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+# Tokenization shared by the per-request vectorizer and the pre-fit corpus model
+TFIDF_PARAMS = {
+    'stop_words': 'english',
+    'ngram_range': (1, 2)
+}
+
+DEFAULT_MODEL_PATH = os.environ.get(
+    'RESUME_ANALYZER_IDF_MODEL',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'tfidf')
+)
+
+VOCABULARY_FILE = 'vocabulary.json'
+IDF_FILE = 'idf.npy'
+
+class IdfModel:
+    def __init__(self, vocabulary: Dict[str, int], idf: np.ndarray):
+        """TF-IDF weights fitted offline on a corpus; request time only transforms"""
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.feature_names = sorted(vocabulary, key=vocabulary.get)
+        # Identifies the weights, so caches of derived results can be keyed on them
+        self.fingerprint = hashlib.sha1(np.ascontiguousarray(idf).tobytes()).hexdigest()[:12]
+        self._counter = CountVectorizer(vocabulary=vocabulary, **TFIDF_PARAMS)
+        # Validate the fixed vocabulary now so concurrent transforms never mutate the counter
+        self._counter.fit([''])
+
+    @classmethod
+    def build(cls, texts: Iterable[str], max_features: int = 20000) -> 'IdfModel':
+        """Fit vocabulary and IDF on a corpus of preprocessed texts"""
+        vectorizer = TfidfVectorizer(max_features=max_features, **TFIDF_PARAMS)
+        vectorizer.fit(texts)
+        vocabulary = {term: int(index) for term, index in vectorizer.vocabulary_.items()}
+        return cls(vocabulary, vectorizer.idf_.astype(np.float64))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> 'IdfModel':
+        """Load a saved model; the IDF array is memory-mapped so worker processes share its pages"""
+        with open(os.path.join(path, VOCABULARY_FILE), encoding='utf-8') as f:
+            vocabulary = json.load(f)
+        idf = np.load(os.path.join(path, IDF_FILE), mmap_mode='r')
+        return cls(vocabulary, idf)
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        """Write the vocabulary and IDF array to a model directory"""
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.vocabulary, f)
+        np.save(os.path.join(path, IDF_FILE), np.asarray(self.idf))
+
+    def transform(self, texts: List[str]):
+        """Return L2-normalized TF-IDF rows, as TfidfVectorizer.transform would"""
+        counts = self._counter.transform(texts).astype(np.float64)
+        counts.data *= self.idf[counts.indices]
+        return normalize(counts, norm='l2', copy=False)
+
+def load_idf_model(path: Optional[str] = DEFAULT_MODEL_PATH) -> Optional[IdfModel]:
+    """Return the model saved at path, or None when it has not been built"""
+    if not path or not os.path.exists(os.path.join(path, IDF_FILE)):
+        return None
+    return IdfModel.load(path)
+
+def iter_corpus_texts(folders: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """Yield (path, raw text) for every resume or job description file under the folders"""
+    from utils.resume_parser import ResumeParser, iter_resume_files, FILE_TYPES
+
+    parser = ResumeParser()
+    for folder in folders:
+        for path in iter_resume_files(folder):
+            file_type = FILE_TYPES[os.path.splitext(path)[1].lower()]
+            try:
+                if file_type == 'pdf':
+                    text = parser.extract_text_from_pdf(path)
+                elif file_type == 'docx':
+                    text = parser.extract_text_from_docx(path)
+                else:
+                    with open(path, encoding='utf-8', errors='ignore') as f:
+                        text = f.read()
+            except Exception as e:
+                print(f"Skipping {path}: {e}")
+                continue
+            yield path, text
+
+def main():
+    """Build the corpus IDF model from folders of resumes and job descriptions"""
+    from utils.analyzer import ResumeAnalyzer
+
+    arg_parser = argparse.ArgumentParser(description="Fit the TF-IDF vocabulary and IDF on a corpus")
+    arg_parser.add_argument('corpus', nargs='+', help="Folders of .txt/.pdf/.docx resumes and job descriptions")
+    arg_parser.add_argument('--out', default=DEFAULT_MODEL_PATH, help="Model directory to write")
+    arg_parser.add_argument('--max-features', type=int, default=20000)
+    args = arg_parser.parse_args()
+
+    analyzer = ResumeAnalyzer(idf_model_path=None)
+    texts = (analyzer.preprocess_text(text) for _, text in iter_corpus_texts(args.corpus))
+    model = IdfModel.build(texts, max_features=args.max_features)
+    model.save(args.out)
+    print(f"Saved {len(model.vocabulary)} terms to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+
+from utils.pipeline import STAGES, AnalysisPipeline, build_pipeline
+
+# Per-process state of the worker processes
+_pipeline: Optional[AnalysisPipeline] = None
+_progress = None
+
+def _init_worker(progress, max_pages: Optional[int], max_bytes: Optional[int]) -> None:
+    """Load the models once per worker process"""
+    global _pipeline, _progress
+    _pipeline = build_pipeline(max_pages, max_bytes)
+    _progress = progress
+
+def _run_job(job_id: str, file_content, file_type: str, job_description: str) -> Tuple[Dict, Dict, Dict, List[Dict]]:
+    """Run the analysis pipeline for one job, publishing the stage it is in"""
+    if isinstance(file_content, bytes):
+        file_content = BytesIO(file_content)
+
+    def on_stage(stage: str) -> None:
+        _progress[job_id] = stage
+
+    try:
+        return _pipeline.run(file_content, file_type, job_description, on_stage=on_stage)
+    finally:
+        _progress.pop(job_id, None)
+
+class AnalysisJobs:
+    def __init__(self, max_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 max_finished: int = 256, max_pages: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Bounded process pool running analyses in the background, addressed by job ID.
+
+        Workers are spawned rather than forked, so they never inherit the server's threads.
+        max_pages and max_bytes are the workers' PDF extraction budget (see ResumeParser).
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_pending = max_pending or self.max_workers * 4
+        # Finished jobs wait for their session to collect them; abandoned ones are dropped oldest first
+        self.max_finished = max_finished
+        self.hits = {stage: 0 for stage in STAGES}
+        self.misses = {stage: 0 for stage in STAGES}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self._context = multiprocessing.get_context('spawn')
+        self._manager = self._context.Manager()
+        self._progress = self._manager.dict()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=self._context,
+            initializer=_init_worker, initargs=(self._progress, self.max_pages, self.max_bytes)
+        )
+
+    def pending(self) -> int:
+        """Jobs submitted but not finished"""
+        with self._lock:
+            return sum(not future.done() for future in self._futures.values())
+
+    def submit(self, file_content, file_type: str, job_description: str) -> str:
+        """Queue an analysis and return its job ID; file_content is text or the file's bytes"""
+        with self._lock:
+            if sum(not future.done() for future in self._futures.values()) >= self.max_pending:
+                raise Exception("Too many analyses are in progress, please try again in a moment")
+            job_id = uuid.uuid4().hex
+            try:
+                future = self._executor.submit(_run_job, job_id, file_content, file_type, job_description)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory), which breaks the whole pool; its jobs
+                # have already failed, so start a fresh pool for this and later jobs
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+                future = self._executor.submit(_run_job, job_id, file_content, file_type, job_description)
+            self._futures[job_id] = future
+            finished = [key for key, future in self._futures.items() if future.done()]
+            for key in finished[:max(0, len(finished) - self.max_finished)]:
+                del self._futures[key]
+        return job_id
+
+    def status(self, job_id: str) -> Dict:
+        """State of a job ('queued', 'running', 'done', 'failed' or 'unknown') and its current stage"""
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            return {'job_id': job_id, 'state': 'unknown', 'stage': None, 'completed_stages': 0, 'error': None}
+        if future.done():
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                error = Exception("The analysis worker stopped unexpectedly, please try again")
+            return {
+                'job_id': job_id,
+                'state': 'failed' if error is not None else 'done',
+                'stage': None,
+                'completed_stages': len(STAGES) if error is None else 0,
+                'error': str(error) if error is not None else None
+            }
+        stage = self._progress.get(job_id)
+        return {
+            'job_id': job_id,
+            'state': 'running' if stage else 'queued',
+            'stage': stage,
+            'completed_stages': STAGES.index(stage) if stage else 0,
+            'error': None
+        }
+
+    def result(self, job_id: str) -> Tuple[Dict, Dict, Dict, List[Dict]]:
+        """Return a finished job's pipeline output and forget the job; re-raises its error"""
+        with self._lock:
+            future = self._futures.pop(job_id)
+        resume_data, analysis_results, recommendations, stage_report = future.result()
+        with self._lock:
+            for stage in stage_report:
+                counters = self.hits if stage['cached'] else self.misses
+                counters[stage['stage']] += 1
+        return resume_data, analysis_results, recommendations, stage_report
+
+    def discard(self, job_id: str) -> None:
+        """Forget a job, cancelling it if it has not started"""
+        with self._lock:
+            future = self._futures.pop(job_id, None)
+        if future is not None:
+            future.cancel()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage hit/miss counters over collected jobs"""
+        with self._lock:
+            return {stage: {'hits': self.hits[stage], 'misses': self.misses[stage]} for stage in STAGES}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+        self._manager.shutdown()
@@ -0,0 +1,42 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+MODEL_NAME = "en_core_web_sm"
+
+# Pipes needed for entity extraction only
+NER_PIPES = ('ner',)
+
+_models: Dict[Tuple[str, Tuple[str, ...]], object] = {}
+_lock = threading.Lock()
+
+def _model_pipes(name: str) -> Optional[List[str]]:
+    """Return the component names shipped with an installed model package, if known"""
+    import spacy
+    try:
+        meta = spacy.util.get_model_meta(spacy.util.get_package_path(name))
+    except Exception:
+        return None
+    return list(meta.get('components') or meta.get('pipeline') or [])
+
+def get_nlp(enable: Tuple[str, ...] = NER_PIPES, name: str = MODEL_NAME):
+    """Return the process-wide spaCy model with only the given pipes, loading it on first use"""
+    key = (name, tuple(enable))
+    nlp = _models.get(key)
+    if nlp is not None:
+        return nlp
+
+    with _lock:
+        nlp = _models.get(key)
+        if nlp is None:
+            try:
+                import spacy
+                pipes = _model_pipes(name)
+                if pipes is None:
+                    nlp = spacy.load(name, enable=list(enable))
+                else:
+                    # Components outside `enable` are never loaded into memory
+                    nlp = spacy.load(name, exclude=[pipe for pipe in pipes if pipe not in enable])
+            except Exception:
+                raise Exception(f"Please install spaCy English model: python -m spacy download {name}")
+            _models[key] = nlp
+    return nlp
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'resume_analyzer', 'parse_cache.sqlite3')
+
+class ParseCache:
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 64 * 1024 * 1024):
+        """Persistent, size-bounded LRU store of JSON results such as parse_resume output"""
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS parse_cache ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS parse_cache_lru ON parse_cache (last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(content: bytes, file_type: str, parser_version: str, skills_version: str) -> str:
+        """Content-addressed key: file bytes plus everything that changes the parse output"""
+        digest = hashlib.sha256(content)
+        digest.update(f"\0{file_type}\0{parser_version}\0{skills_version}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM parse_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE parse_cache SET last_access = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict) -> None:
+        """Store a result and evict least recently used entries beyond max_bytes"""
+        payload = json.dumps(value)
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO parse_cache (key, value, size, last_access) VALUES (?, ?, ?, ?)',
+                (key, payload, size, time.time())
+            )
+            total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM parse_cache').fetchone()[0]
+            if total > self.max_bytes:
+                rows = self._conn.execute('SELECT key, size FROM parse_cache ORDER BY last_access').fetchall()
+                for old_key, old_size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._conn.execute('DELETE FROM parse_cache WHERE key = ?', (old_key,))
+                    total -= old_size
+                    self.evictions += 1
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock:
+            self._conn.execute('DELETE FROM parse_cache')
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            entries, total = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache'
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'size_bytes': total
+        }
@@ -0,0 +1,192 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.analyzer import ResumeAnalyzer
+from utils.document import Document
+from utils.parse_cache import DEFAULT_CACHE_PATH, ParseCache
+from utils.recommendations import RecommendationEngine
+from utils.requirements_cache import DEFAULT_STORE_PATH, RequirementsCache
+from utils.resume_parser import ResumeParser
+from data.skills_database import get_all_skills, get_skills_version
+
+# Bump whenever a change alters any stage's output, invalidating persisted stage results
+PIPELINE_VERSION = "1"
+
+DEFAULT_STAGE_STORE_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), 'stage_cache.sqlite3')
+
+# In dependency order; each stage only reads the outputs of stages before it
+STAGES = ('parse_resume', 'job_requirements', 'similarity', 'skill_match', 'score_breakdown', 'recommendations')
+
+STAGE_LABELS = {
+    'parse_resume': 'Parse resume',
+    'job_requirements': 'Job requirements',
+    'similarity': 'Similarity',
+    'skill_match': 'Skill match',
+    'score_breakdown': 'Score breakdown',
+    'recommendations': 'Recommendations',
+}
+
+def fingerprint(*values) -> str:
+    """Stable hash of JSON-serializable stage inputs"""
+    payload = json.dumps(values, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def sorted_skills(skill_analysis: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Skill lists in a stable order; they are built from sets, whose order varies per process"""
+    return {name: sorted(skills) for name, skills in skill_analysis.items()}
+
+class AnalysisPipeline:
+    def __init__(self, parser: ResumeParser, analyzer: ResumeAnalyzer, recommender: RecommendationEngine,
+                 skills_database: List[str], maxsize: int = 64, store: Optional[ParseCache] = None):
+        """Parse -> analyze -> recommend as explicit stages, each memoized by the hash of its inputs.
+
+        A stage's key covers only the values it reads, so editing the job description
+        reuses the parsed resume, and a resume edit that leaves the skills unchanged
+        reuses the skill match. Stage outputs are kept in a bounded in-memory LRU and,
+        when a store is given, in SQLite, so every process sharing it reuses them.
+        """
+        self.parser = parser
+        self.analyzer = analyzer
+        self.recommender = recommender
+        self.skills_database = skills_database
+        self.maxsize = maxsize
+        self.store = store
+        self.hits = {stage: 0 for stage in STAGES}
+        self.misses = {stage: 0 for stage in STAGES}
+        self._memo: Dict[str, OrderedDict] = {stage: OrderedDict() for stage in STAGES}
+        self._lock = threading.Lock()
+
+    def _stage(self, stage: str, key: str, compute: Callable, report: List[Dict]):
+        """Return the output for key from memory or the store, computing and storing it on a miss"""
+        start = time.perf_counter()
+        with self._lock:
+            memo = self._memo[stage]
+            cached = key in memo
+            if cached:
+                memo.move_to_end(key)
+                self.hits[stage] += 1
+                value = memo[key]
+        if not cached:
+            store_key = f"{PIPELINE_VERSION}:{stage}:{key}"
+            value = self.store.get(store_key) if self.store is not None else None
+            cached = value is not None
+            if not cached:
+                value = compute()
+                if self.store is not None:
+                    self.store.put(store_key, value)
+            with self._lock:
+                counters = self.hits if cached else self.misses
+                counters[stage] += 1
+                memo[key] = value
+                while len(memo) > self.maxsize:
+                    memo.popitem(last=False)
+        report.append({'stage': stage, 'cached': cached, 'seconds': time.perf_counter() - start})
+        # Outputs are shared between sessions; callers get their own copy
+        return copy.deepcopy(value)
+
+    def run(self, file_content, file_type: str, job_description: str,
+            on_stage: Optional[Callable[[str], None]] = None) -> Tuple[Dict, Dict, Dict, List[Dict]]:
+        """Return (resume_data, analysis_results, recommendations, stage report).
+
+        on_stage, if given, is called with each stage's name as the stage starts.
+        """
+        analyzer = self.analyzer
+        report: List[Dict] = []
+
+        def stage(name: str, key: str, compute: Callable):
+            if on_stage is not None:
+                on_stage(name)
+            return self._stage(name, key, compute, report)
+
+        resume_key = ParseCache.make_key(
+            self.parser.read_content_bytes(file_content, file_type), file_type,
+            self.parser.parser_version, get_skills_version(self.skills_database)
+        )
+        # One Document per text, handed to every stage that reads it, so each view
+        # (normalized, preprocessed, word count, ...) is computed once per run
+        parsed = {}
+
+        def parse_resume():
+            resume_data, parsed['document'] = self.parser.parse_resume_document(
+                file_content, file_type, self.skills_database
+            )
+            return resume_data
+
+        resume_data = stage('parse_resume', resume_key, parse_resume)
+        resume_document = parsed['document'] if 'document' in parsed else Document(resume_data['raw_text'])
+        job_document = Document(job_description)
+
+        requirements_key = analyzer.requirements_cache.make_key(job_document, analyzer.requirements_version)
+        job_requirements = stage(
+            'job_requirements', requirements_key,
+            lambda: analyzer.get_job_requirements(job_document)
+        )
+
+        def similarity():
+            scores = {'similarity_score': analyzer.calculate_similarity_score(resume_document, job_document)}
+            semantic_similarity = analyzer.calculate_semantic_similarity(resume_document, job_document)
+            if semantic_similarity is not None:
+                scores['semantic_similarity'] = semantic_similarity
+            return scores
+
+        similarity_scores = stage(
+            'similarity',
+            fingerprint(resume_key, requirements_key, analyzer.similarity_version),
+            similarity
+        )
+        similarity_score = similarity_scores['similarity_score']
+
+        skill_analysis = stage(
+            'skill_match', fingerprint(sorted(resume_data['skills']), requirements_key),
+            lambda: analyzer.analyze_skill_match(resume_data['skills'], job_requirements)
+        )
+
+        score_breakdown = stage(
+            'score_breakdown',
+            fingerprint(resume_data['experience_years'], requirements_key, sorted_skills(skill_analysis),
+                        similarity_score),
+            lambda: analyzer.generate_score_breakdown(resume_data, job_requirements, skill_analysis, similarity_score)
+        )
+
+        recommendations = stage(
+            'recommendations',
+            fingerprint(resume_data['experience_years'], resume_data['word_count'], resume_data['contact_info'],
+                        requirements_key, sorted_skills(skill_analysis), score_breakdown),
+            lambda: self.recommender.generate_comprehensive_recommendations(
+                resume_data, job_requirements, skill_analysis, score_breakdown, resume_document
+            )
+        )
+
+        # Same shape as ResumeAnalyzer.perform_full_analysis
+        analysis_results = {
+            'job_requirements': job_requirements,
+            'skill_analysis': skill_analysis,
+            'score_breakdown': score_breakdown,
+            'similarity_score': similarity_score
+        }
+        if 'semantic_similarity' in similarity_scores:
+            analysis_results['semantic_similarity'] = similarity_scores['semantic_similarity']
+
+        return resume_data, analysis_results, recommendations, report
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-stage hit/miss counters since startup"""
+        with self._lock:
+            return {stage: {'hits': self.hits[stage], 'misses': self.misses[stage]} for stage in STAGES}
+
+def build_pipeline(max_pages: Optional[int] = None, max_bytes: Optional[int] = None) -> AnalysisPipeline:
+    """Pipeline over the persistent parse and job-requirements caches, as the app runs it.
+
+    max_pages and max_bytes are the parser's extraction budget; pass ResumeParser.MAX_PDF_PAGES
+    and ResumeParser.MAX_TEXT_BYTES when parsing untrusted uploads.
+    """
+    parser = ResumeParser(max_pages=max_pages, max_bytes=max_bytes, cache=ParseCache())
+    analyzer = ResumeAnalyzer(requirements_cache=RequirementsCache(store=ParseCache(DEFAULT_STORE_PATH)))
+    return AnalysisPipeline(parser, analyzer, RecommendationEngine(), get_all_skills(),
+                            store=ParseCache(DEFAULT_STAGE_STORE_PATH))
@@ -1,6 +1,8 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
 import random
 
+from utils.document import Document
+
 class RecommendationEngine:
     def __init__(self):
         self.ats_tips = [
@@ -128,9 +130,13 @@ class RecommendationEngine:
             return 'low_score'
     
     def generate_comprehensive_recommendations(self, resume_data: Dict, job_requirements: Dict, 
-                                            skill_analysis: Dict, score_breakdown: Dict) -> Dict[str, List[str]]:
+                                            skill_analysis: Dict, score_breakdown: Dict,
+                                            resume_document: Optional[Document] = None) -> Dict[str, List[str]]:
         """Generate comprehensive recommendations based on analysis"""
         priority = self.get_improvement_priority(score_breakdown)
+        if resume_document is not None:
+            # Length checks read the parsed Document's cached word count
+            resume_data = dict(resume_data, word_count=resume_document.word_count)
         
         recommendations = {
             'skill_recommendations': self.generate_skill_recommendations(skill_analysis, job_requirements),
@@ -0,0 +1,73 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+from utils.document import Document
+from utils.parse_cache import DEFAULT_CACHE_PATH, ParseCache
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), 'requirements_cache.sqlite3')
+
+class RequirementsCache:
+    def __init__(self, maxsize: int = 256, store: Optional[ParseCache] = None):
+        """Bounded in-memory LRU of job requirements, optionally backed by a persistent store"""
+        self.maxsize = maxsize
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(job_description: Union[str, Document]) -> str:
+        """The job description as keyed; requirements must be extracted from this text"""
+        return Document.of(job_description).normalized
+
+    @classmethod
+    def make_key(cls, job_description: Union[str, Document], version: str) -> str:
+        """Fingerprint of the whitespace-normalized job description and the analyzer version"""
+        return hashlib.sha256(f"{version}\0{cls.normalize(job_description)}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached requirements, or None on a miss"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(value)
+
+        value = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Dict) -> None:
+        """Store requirements in memory and, when configured, in the persistent store"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(key, value)
+        if self.store is not None:
+            self.store.put(key, value)
+
+    def _remember(self, key: str, value: Dict) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters for the job-description side of the analysis"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self._entries)
+        }
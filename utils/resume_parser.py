@@ -1,39 +1,229 @@
 import PyPDF2
 import docx
 import pdfplumber
-import spacy
 import re
-from typing import Dict, List, Optional
+import os
+import zipfile
+from xml.etree import ElementTree
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.document import Document
+from utils.parse_cache import ParseCache
+from utils.sections import ResumeSections
+from utils.skill_matcher import get_skill_matcher
+from data.skills_database import get_skills_version
+
+# Bump whenever a change to extraction alters parse_resume output, invalidating cached results
+PARSER_VERSION = "5"
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Trailing context is lookahead-only so one alternative never swallows text another needs
+EXPERIENCE_PATTERN = re.compile(
+    r'(\d+)(?=\+?\s*years?\s*(?:of\s*)?experience)'
+    r'|experience\s*[:\-]?\s*(\d+)(?=\+?\s*years?)'
+    r'|(\d+)(?=\+?\s*years?\s*in)'
+)
+EDUCATION_KEYWORDS = [
+    'bachelor', 'master', 'phd', 'doctorate', 'mba', 'b.s.', 'm.s.', 
+    'b.a.', 'm.a.', 'b.tech', 'm.tech', 'diploma', 'certificate'
+]
+
+# WordprocessingML tags read by the streaming DOCX extractor
+DOCX_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_PARAGRAPH = DOCX_NAMESPACE + 'p'
+DOCX_RUN = DOCX_NAMESPACE + 'r'
+DOCX_TEXT = DOCX_NAMESPACE + 't'
+DOCX_TAB = DOCX_NAMESPACE + 'tab'
+DOCX_BREAKS = (DOCX_NAMESPACE + 'br', DOCX_NAMESPACE + 'cr')
+# Word writes text boxes twice, as mc:Choice (DrawingML) and mc:Fallback (VML); only the choice is read
+DOCX_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# File extensions understood by parse_many, mapped to parse_resume file types
+FILE_TYPES = {
+    '.pdf': 'pdf',
+    '.docx': 'docx',
+    '.txt': 'text',
+}
+
+# Per-process parser state for parse_many workers
+_worker_parser = None
+_worker_skills = None
+
+def _init_worker(skills_database: List[str], max_pages: Optional[int], max_bytes: Optional[int],
+                 cache_path: Optional[str]) -> None:
+    """Create one parser per worker process"""
+    global _worker_parser, _worker_skills
+    cache = ParseCache(cache_path) if cache_path else None
+    _worker_parser = ResumeParser(max_pages=max_pages, max_bytes=max_bytes, cache=cache)
+    _worker_skills = skills_database
+
+def read_resume_file(path: str) -> Tuple[Union[str, os.PathLike], str]:
+    """Return (file_content, file_type) for parse_resume from a resume file's path"""
+    file_type = FILE_TYPES[os.path.splitext(path)[1].lower()]
+    if file_type == 'text':
+        with open(path, encoding='utf-8', errors='ignore') as f:
+            return f.read(), file_type
+    return path, file_type
+
+def _parse_file(path: str) -> Dict:
+    """Parse a single file, reporting failures instead of raising"""
+    try:
+        content, file_type = read_resume_file(path)
+        return {'path': path, 'result': _worker_parser.parse_resume(content, file_type, _worker_skills), 'error': None}
+    except Exception as e:
+        return {'path': path, 'result': None, 'error': str(e)}
+
+def _parse_chunk(paths: List[str]) -> List[Dict]:
+    """Parse a chunk of files in a worker process"""
+    return [_parse_file(path) for path in paths]
+
+def iter_chunk_results(executor: Executor, function: Callable[[List], List], items: Iterable,
+                       chunksize: int, max_pending: int) -> Iterator:
+    """Run function over chunks of items, yielding each chunk's results as it finishes.
+
+    At most max_pending chunks are in flight, so huge inputs never materialize at once.
+    """
+    items = iter(items)
+    pending = set()
+    exhausted = False
+    while True:
+        while not exhausted and len(pending) < max_pending:
+            chunk = list(islice(items, chunksize))
+            if not chunk:
+                exhausted = True
+                break
+            pending.add(executor.submit(function, chunk))
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield from future.result()
+
+def iter_resume_files(source: Union[str, Iterable[str]]) -> Iterator[str]:
+    """Yield resume file paths from a directory (recursively) or an iterable of paths"""
+    if isinstance(source, (str, os.PathLike)):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if os.path.splitext(name)[1].lower() in FILE_TYPES:
+                    yield os.path.join(root, name)
+    else:
+        for path in source:
+            yield os.fspath(path)
 
 class ResumeParser:
-    def __init__(self):
-        # Load spaCy model
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except:
-            raise Exception("Please install spaCy English model: python -m spacy download en_core_web_sm")
+    # Extraction budget for untrusted uploads, so oversized files cannot dominate latency and
+    # memory; text past it is dropped, so the app and server pass it while local batches do not
+    MAX_PDF_PAGES = 30
+    MAX_TEXT_BYTES = 512 * 1024
+
+    def __init__(self, max_pages: Optional[int] = None, max_bytes: Optional[int] = None,
+                 cache: Optional[ParseCache] = None):
+        """Resume parser; max_pages and max_bytes cap PDF extraction (None reads the whole file)"""
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.cache = cache
     
-    def extract_text_from_pdf(self, pdf_file) -> str:
-        """Extract text from PDF file using pdfplumber"""
-        text = ""
+    def iter_pdf_pages(self, pdf_file, max_pages: Optional[int] = None,
+                       max_bytes: Optional[int] = None) -> Iterator[str]:
+        """Yield PDF text page by page using pdfplumber, stopping at the page or byte budget"""
+        max_pages = self.max_pages if max_pages is None else max_pages
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        pages_read = 0
+        bytes_left = max_bytes
+
+        def bounded(page_text: str) -> str:
+            # Trim the page to whatever is left of the byte budget
+            nonlocal bytes_left
+            if bytes_left is None:
+                return page_text
+            encoded = page_text.encode('utf-8')
+            if len(encoded) > bytes_left:
+                page_text = encoded[:bytes_left].decode('utf-8', errors='ignore')
+                encoded = page_text.encode('utf-8')
+            bytes_left -= len(encoded)
+            return page_text
+
         try:
             with pdfplumber.open(pdf_file) as pdf:
                 for page in pdf.pages:
+                    if (max_pages is not None and pages_read >= max_pages) or bytes_left == 0:
+                        return
                     page_text = page.extract_text()
+                    pages_read += 1
                     if page_text:
-                        text += page_text + "\n"
+                        yield bounded(page_text)
         except Exception as e:
-            # Fallback to PyPDF2
+            # Fallback to PyPDF2, skipping pages already yielded by pdfplumber
             try:
                 pdf_reader = PyPDF2.PdfReader(pdf_file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+                for page_number, page in enumerate(pdf_reader.pages):
+                    if page_number < pages_read:
+                        continue
+                    if (max_pages is not None and page_number >= max_pages) or bytes_left == 0:
+                        return
+                    yield bounded(page.extract_text())
             except Exception as e2:
                 raise Exception(f"Failed to extract PDF text: {e2}")
-        return text
+
+    def extract_text_from_pdf(self, pdf_file) -> str:
+        """Extract text from PDF file using pdfplumber"""
+        # Pages are read lazily, so the budget stops extraction early; the text is still
+        # joined because raw_text, skills and sections all need the whole document
+        return ''.join(page_text + "\n" for page_text in self.iter_pdf_pages(pdf_file))
+    
+    def iter_docx_paragraphs(self, docx_file) -> Iterator[str]:
+        """Stream paragraph text, including table cells, straight from word/document.xml"""
+        with zipfile.ZipFile(docx_file) as archive:
+            with archive.open('word/document.xml') as document:
+                # Paragraphs can nest (text boxes), so keep one buffer per open paragraph
+                open_paragraphs = []
+                run_depth = 0
+                fallback_depth = 0
+                for event, element in ElementTree.iterparse(document, events=('start', 'end')):
+                    tag = element.tag
+                    if tag == DOCX_FALLBACK:
+                        fallback_depth += 1 if event == 'start' else -1
+                        continue
+                    if fallback_depth:
+                        continue
+                    if event == 'start':
+                        if tag == DOCX_PARAGRAPH:
+                            open_paragraphs.append([])
+                        elif tag == DOCX_RUN:
+                            run_depth += 1
+                        continue
+                    if tag == DOCX_RUN:
+                        run_depth -= 1
+                    elif not open_paragraphs:
+                        continue
+                    elif tag == DOCX_PARAGRAPH:
+                        yield ''.join(open_paragraphs.pop())
+                        element.clear()
+                    # Tab and break tags outside runs are tab-stop and layout settings, not text
+                    elif not run_depth:
+                        continue
+                    elif tag == DOCX_TEXT:
+                        open_paragraphs[-1].append(element.text or '')
+                    elif tag == DOCX_TAB:
+                        open_paragraphs[-1].append('\t')
+                    elif tag in DOCX_BREAKS:
+                        open_paragraphs[-1].append('\n')
     
     def extract_text_from_docx(self, docx_file) -> str:
         """Extract text from DOCX file"""
+        try:
+            return ''.join(paragraph + "\n" for paragraph in self.iter_docx_paragraphs(docx_file))
+        except Exception:
+            # Fall back to the python-docx object model
+            if hasattr(docx_file, 'seek'):
+                docx_file.seek(0)
+            return self.extract_text_from_docx_document(docx_file)
+    
+    def extract_text_from_docx_document(self, docx_file) -> str:
+        """Extract text from DOCX file using python-docx"""
         try:
             doc = docx.Document(docx_file)
             text = ""
@@ -43,29 +233,24 @@ class ResumeParser:
         except Exception as e:
             raise Exception(f"Failed to extract DOCX text: {e}")
     
-    def extract_contact_info(self, text: str) -> Dict[str, Optional[str]]:
+    def extract_contact_info(self, text: str, sections: Optional[ResumeSections] = None) -> Dict[str, Optional[str]]:
         """Extract contact information from resume text"""
         contact_info = {
             'email': None,
             'phone': None,
             'name': None
         }
+        sections = sections or ResumeSections(text)
         
-        # Email extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            contact_info['email'] = email_match.group()
-        
-        # Phone extraction
-        phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        phone_match = re.search(phone_pattern, text)
-        if phone_match:
-            contact_info['phone'] = phone_match.group()
+        # Contact details live in the header; only scan the rest when the header has none
+        header = sections.region('header')
+        for field, pattern in (('email', EMAIL_PATTERN), ('phone', PHONE_PATTERN)):
+            match = pattern.search(header) or (pattern.search(text) if len(header) < len(text) else None)
+            if match:
+                contact_info[field] = match.group()
         
         # Name extraction (first few words, usually name)
-        lines = text.split('\n')
-        for line in lines[:5]:  # Check first 5 lines
+        for line in sections.lines[:5]:  # Check first 5 lines
             line = line.strip()
             if line and len(line.split()) <= 4 and len(line) > 3:
                 # Simple heuristic: if it's short and at the top, likely a name
@@ -75,54 +260,79 @@ class ResumeParser:
         
         return contact_info
     
-    def extract_skills(self, text: str, skills_database: List[str]) -> List[str]:
+    def extract_skills(self, text: Union[str, Document], skills_database: List[str]) -> List[str]:
         """Extract skills from resume text using predefined skills database"""
-        found_skills = []
-        text_lower = text.lower()
-        
-        for skill in skills_database:
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(skill.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found_skills.append(skill)
-        
-        return list(set(found_skills))  # Remove duplicates
+        # One compiled matcher per skills database, scanning the text once with word-boundary checks
+        matcher = get_skill_matcher(tuple(skills_database))
+        return matcher.find_all(Document.of(text).lower)
     
-    def extract_experience_years(self, text: str) -> int:
+    def extract_experience_years(self, text: Union[str, Document]) -> int:
         """Extract years of experience from resume text"""
-        # Look for patterns like "3 years", "5+ years", etc.
-        experience_patterns = [
-            r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-            r'experience\s*[:\-]?\s*(\d+)\+?\s*years?',
-            r'(\d+)\+?\s*years?\s*in',
-        ]
-        
-        years = []
-        for pattern in experience_patterns:
-            matches = re.findall(pattern, text.lower())
-            years.extend([int(match) for match in matches])
-        
+        # Look for patterns like "3 years", "5+ years", etc. in one combined scan
+        years = [int(match.group(match.lastindex)) for match in EXPERIENCE_PATTERN.finditer(Document.of(text).lower)]
         return max(years) if years else 0
     
-    def extract_education(self, text: str) -> List[str]:
+    def extract_education(self, text: str, sections: Optional[ResumeSections] = None) -> List[str]:
         """Extract education information from resume text"""
-        education_keywords = [
-            'bachelor', 'master', 'phd', 'doctorate', 'mba', 'b.s.', 'm.s.', 
-            'b.a.', 'm.a.', 'b.tech', 'm.tech', 'diploma', 'certificate'
-        ]
+        sections = sections or ResumeSections(text)
         
-        education = []
-        lines = text.split('\n')
+        # Prefer the education and certification sections when the resume has headings for them
+        if sections.has_section('education') or sections.has_section('certifications'):
+            lines = sections.region('education', 'certifications').split('\n')
+        else:
+            lines = sections.lines
         
+        education = []
         for line in lines:
             line_lower = line.lower()
-            if any(keyword in line_lower for keyword in education_keywords):
+            if any(keyword in line_lower for keyword in EDUCATION_KEYWORDS):
                 education.append(line.strip())
         
         return education
     
+    def read_content_bytes(self, file_content, file_type: str) -> bytes:
+        """Return the raw bytes of an upload, path or text without consuming the stream"""
+        if file_type not in ('pdf', 'docx'):
+            return file_content.encode('utf-8')
+        if isinstance(file_content, (str, os.PathLike)):
+            with open(file_content, 'rb') as f:
+                return f.read()
+        if hasattr(file_content, 'getvalue'):
+            return file_content.getvalue()
+        position = file_content.tell()
+        content = file_content.read()
+        file_content.seek(position)
+        return content
+
+    @property
+    def parser_version(self) -> str:
+        """Identifies everything besides the input that shapes parse_resume output"""
+        return f"{PARSER_VERSION}:{self.max_pages}:{self.max_bytes}"
+
     def parse_resume(self, file_content, file_type: str, skills_database: List[str]) -> Dict:
         """Main parsing function that orchestrates all extraction methods"""
+        return self.parse_resume_document(file_content, file_type, skills_database)[0]
+
+    def parse_resume_document(self, file_content, file_type: str,
+                              skills_database: List[str]) -> Tuple[Dict, Document]:
+        """parse_resume, also returning the Document of the resume text for the analysis steps"""
+        if self.cache is None:
+            return self._parse_resume(file_content, file_type, skills_database)
+
+        # Repeat uploads are served from the content-addressed cache
+        key = self.cache.make_key(
+            self.read_content_bytes(file_content, file_type), file_type,
+            self.parser_version, get_skills_version(skills_database)
+        )
+        result = self.cache.get(key)
+        if result is not None:
+            return result, Document(result['raw_text'])
+        result, document = self._parse_resume(file_content, file_type, skills_database)
+        self.cache.put(key, result)
+        return result, document
+
+    def _parse_resume(self, file_content, file_type: str, skills_database: List[str]) -> Tuple[Dict, Document]:
+        """Parse without consulting the cache"""
         # Extract text based on file type
         if file_type == 'pdf':
             text = self.extract_text_from_pdf(file_content)
@@ -131,17 +341,36 @@ class ResumeParser:
         else:
             text = file_content  # Assume it's already text
         
-        # Extract all information
-        contact_info = self.extract_contact_info(text)
-        skills = self.extract_skills(text, skills_database)
-        experience_years = self.extract_experience_years(text)
-        education = self.extract_education(text)
+        # Segment once and hand each extractor the region it needs; every extractor
+        # shares the document's cached lowercase, line and token views
+        document = Document(text)
+        sections = ResumeSections(document)
+        contact_info = self.extract_contact_info(text, sections)
+        skills = self.extract_skills(document, skills_database)
+        experience_years = self.extract_experience_years(document)
+        education = self.extract_education(text, sections)
         
-        return {
+        result = {
             'raw_text': text,
             'contact_info': contact_info,
             'skills': skills,
             'experience_years': experience_years,
             'education': education,
-            'word_count': len(text.split())
-        }
\ No newline at end of file
+            'word_count': document.word_count
+        }
+        return result, document
+    
+    def parse_many(self, source: Union[str, Iterable[str]], skills_database: List[str],
+                   max_workers: Optional[int] = None, chunksize: int = 8) -> Iterator[Dict]:
+        """Parse many resume files across a process pool, yielding results as they finish.
+
+        Each yielded dict has 'path', 'result' (the parse_resume output) and 'error'
+        (None on success). A failing file never stops the batch.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        cache_path = self.cache.path if self.cache else None
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(list(skills_database), self.max_pages, self.max_bytes,
+                                           cache_path)) as executor:
+            yield from iter_chunk_results(executor, _parse_chunk, iter_resume_files(source),
+                                          chunksize, max_workers * 2)
@@ -0,0 +1,247 @@
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from utils.parse_cache import DEFAULT_CACHE_PATH
+from utils.skill_matcher import get_skill_matcher
+from data.skills_database import get_all_skills
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(DEFAULT_CACHE_PATH), 'resume_index.sqlite3')
+
+# Skills are indexed as whole-phrase terms next to the plain word tokens
+SKILL_PREFIX = 'skill:'
+
+_TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*')
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens without English stop words"""
+    return [token for token in _TOKEN_PATTERN.findall(text.lower()) if token not in ENGLISH_STOP_WORDS]
+
+class ResumeIndex:
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, k1: float = 1.2, b: float = 0.75,
+                 skills_database: Optional[List[str]] = None):
+        """Persistent BM25 inverted index over parsed resumes (raw_text and skills)"""
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.skills_database = tuple(skills_database or get_all_skills())
+        self._lock = threading.RLock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS documents ('
+            ' doc_id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' key TEXT UNIQUE NOT NULL,'
+            ' length INTEGER NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS postings ('
+            ' term TEXT NOT NULL,'
+            ' doc_id INTEGER NOT NULL,'
+            ' tf INTEGER NOT NULL,'
+            ' PRIMARY KEY (term, doc_id))'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id)')
+        self._conn.commit()
+        self._load()
+
+    def _load(self) -> None:
+        """Rebuild the in-memory postings from the database"""
+        # term -> {doc_id: tf}; doc ids only grow, so insertion order is doc-id order
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # Upper bound on each term's tf, used for pruning; stays valid (if loose) after deletes
+        self._max_tf: Dict[str, int] = {}
+        self._keys: Dict[int, str] = {}
+        self._doc_ids: Dict[str, int] = {}
+        self._lengths: Dict[int, int] = {}
+        self._doc_terms: Dict[int, List[str]] = {}
+        self._sorted: Dict[str, Tuple[List[int], List[int]]] = {}
+
+        for doc_id, key, length in self._conn.execute('SELECT doc_id, key, length FROM documents ORDER BY doc_id'):
+            self._keys[doc_id] = key
+            self._doc_ids[key] = doc_id
+            self._lengths[doc_id] = length
+            self._doc_terms[doc_id] = []
+        for term, doc_id, tf in self._conn.execute('SELECT term, doc_id, tf FROM postings ORDER BY term, doc_id'):
+            self._postings.setdefault(term, {})[doc_id] = tf
+            self._max_tf[term] = max(self._max_tf.get(term, 0), tf)
+            self._doc_terms[doc_id].append(term)
+        self._total_length = sum(self._lengths.values())
+        self._min_length = min(self._lengths.values(), default=0)
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def document_terms(self, resume_data: Dict) -> Counter:
+        """Term frequencies for a parsed resume: raw_text tokens plus one term per skill"""
+        terms = Counter(tokenize(resume_data['raw_text']))
+        for skill in resume_data.get('skills', []):
+            terms[SKILL_PREFIX + skill.lower()] = 1
+        return terms
+
+    def add(self, key: str, resume_data: Dict) -> None:
+        """Index a parsed resume under key, replacing any previous version"""
+        self.add_many([(key, resume_data)])
+
+    def add_many(self, items: Iterable[Tuple[str, Dict]]) -> None:
+        """Index many (key, parsed resume) pairs in one transaction"""
+        with self._lock:
+            for key, resume_data in items:
+                self._add(key, resume_data)
+            self._conn.commit()
+
+    def _add(self, key: str, resume_data: Dict) -> None:
+        terms = self.document_terms(resume_data)
+        length = sum(terms.values())
+        self._delete(key)
+        cursor = self._conn.execute('INSERT INTO documents (key, length) VALUES (?, ?)', (key, length))
+        doc_id = cursor.lastrowid
+        self._conn.executemany(
+            'INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)',
+            [(term, doc_id, tf) for term, tf in terms.items()]
+        )
+
+        self._keys[doc_id] = key
+        self._doc_ids[key] = doc_id
+        self._lengths[doc_id] = length
+        self._doc_terms[doc_id] = list(terms)
+        self._total_length += length
+        self._min_length = min(self._min_length, length) if len(self._lengths) > 1 else length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+            self._max_tf[term] = max(self._max_tf.get(term, 0), tf)
+            self._sorted.pop(term, None)
+
+    def delete(self, key: str) -> bool:
+        """Remove a resume from the index; returns False if it was not indexed"""
+        with self._lock:
+            deleted = self._delete(key)
+            self._conn.commit()
+        return deleted
+
+    def _delete(self, key: str) -> bool:
+        doc_id = self._doc_ids.pop(key, None)
+        if doc_id is None:
+            return False
+        self._conn.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+        self._conn.execute('DELETE FROM documents WHERE doc_id = ?', (doc_id,))
+        for term in self._doc_terms.pop(doc_id):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._max_tf[term]
+            self._sorted.pop(term, None)
+        del self._keys[doc_id]
+        self._total_length -= self._lengths.pop(doc_id)
+        return True
+
+    def query_terms(self, job_description: str) -> List[str]:
+        """Distinct query terms for a job description: word tokens plus skills it mentions"""
+        skills = get_skill_matcher(self.skills_database).find_all(job_description.lower())
+        return list(dict.fromkeys(tokenize(job_description) + [SKILL_PREFIX + skill.lower() for skill in skills]))
+
+    def _sorted_postings(self, term: str) -> Tuple[List[int], List[int]]:
+        cached = self._sorted.get(term)
+        if cached is None:
+            postings = self._postings[term]
+            cached = (list(postings), list(postings.values()))
+            self._sorted[term] = cached
+        return cached
+
+    def search(self, job_description: str, top_k: int = 50) -> List[Tuple[str, float]]:
+        """Return the top_k (key, BM25 score) pairs for a job description, best first.
+
+        Document-at-a-time MaxScore: terms whose combined upper bounds cannot lift a
+        document into the current top_k are only probed for documents found via the others.
+        """
+        with self._lock:
+            n_docs = len(self._lengths)
+            if not n_docs or top_k <= 0:
+                return []
+            average_length = self._total_length / n_docs or 1.0
+            k1, b = self.k1, self.b
+
+            terms = []
+            for term in self.query_terms(job_description):
+                if term not in self._postings:
+                    continue
+                doc_ids, tfs = self._sorted_postings(term)
+                idf = math.log(1 + (n_docs - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5))
+                max_tf = self._max_tf[term]
+                # Score grows with tf and shrinks with document length, so this bounds every posting
+                upper_bound = idf * max_tf * (k1 + 1) / (
+                    max_tf + k1 * (1 - b + b * self._min_length / average_length)
+                )
+                terms.append((upper_bound, idf, doc_ids, tfs))
+            if not terms:
+                return []
+            terms.sort(key=lambda term: term[0])
+
+            bounds = [term[0] for term in terms]
+            prefix_bounds = []
+            total = 0.0
+            for bound in bounds:
+                total += bound
+                prefix_bounds.append(total)
+
+            lengths = self._lengths
+            positions = [0] * len(terms)
+            heap: List[Tuple[float, int]] = []
+            threshold = 0.0
+            first_essential = 0
+
+            def term_score(idf, tf, doc_id):
+                return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc_id] / average_length))
+
+            while first_essential < len(terms):
+                # Next candidate: the smallest current document among the essential terms
+                candidate = None
+                for i in range(first_essential, len(terms)):
+                    doc_ids = terms[i][2]
+                    if positions[i] < len(doc_ids) and (candidate is None or doc_ids[positions[i]] < candidate):
+                        candidate = doc_ids[positions[i]]
+                if candidate is None:
+                    break
+
+                score = 0.0
+                for i in range(first_essential, len(terms)):
+                    _, idf, doc_ids, tfs = terms[i]
+                    if positions[i] < len(doc_ids) and doc_ids[positions[i]] == candidate:
+                        score += term_score(idf, tfs[positions[i]], candidate)
+                        positions[i] += 1
+
+                # Probe non-essential terms, largest bound first, while they can still matter
+                for i in range(first_essential - 1, -1, -1):
+                    if score + prefix_bounds[i] <= threshold:
+                        break
+                    _, idf, doc_ids, tfs = terms[i]
+                    positions[i] = bisect_left(doc_ids, candidate, positions[i])
+                    if positions[i] < len(doc_ids) and doc_ids[positions[i]] == candidate:
+                        score += term_score(idf, tfs[positions[i]], candidate)
+
+                if len(heap) < top_k:
+                    heapq.heappush(heap, (score, -candidate))
+                elif score > threshold:
+                    heapq.heapreplace(heap, (score, -candidate))
+                else:
+                    continue
+                if len(heap) == top_k:
+                    threshold = heap[0][0]
+                    while first_essential < len(terms) and prefix_bounds[first_essential] <= threshold:
+                        first_essential += 1
+
+            ranked = sorted(heap, key=lambda item: (-item[0], -item[1]))
+            return [(self._keys[-doc_id], score) for score, doc_id in ranked]
@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional, Union
+
+from utils.document import Document
+
+# Common resume headings, grouped by the section they open
+SECTION_HEADINGS = {
+    'summary': ['summary', 'professional summary', 'profile', 'professional profile', 'objective',
+                'career objective', 'about me'],
+    'experience': ['experience', 'work experience', 'professional experience', 'employment',
+                   'employment history', 'work history', 'career history'],
+    'education': ['education', 'academic background', 'academic qualifications', 'qualifications',
+                  'education and training'],
+    'skills': ['skills', 'technical skills', 'core competencies', 'key skills', 'competencies'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications',
+                       'certifications and licenses', 'training'],
+    'projects': ['projects', 'personal projects', 'academic projects'],
+}
+
+_HEADING_LOOKUP = {
+    heading: section
+    for section, headings in SECTION_HEADINGS.items()
+    for heading in headings
+}
+
+class ResumeSections:
+    def __init__(self, text: Union[str, Document]):
+        """Split resume text into lines and named sections in a single pass"""
+        self.lines = Document.of(text).lines
+        self.sections: Dict[str, List[str]] = {'header': []}
+
+        current = 'header'
+        for line in self.lines:
+            section = self.heading_section(line)
+            if section is not None:
+                current = section
+                self.sections.setdefault(current, [])
+                continue
+            self.sections[current].append(line)
+
+    @staticmethod
+    def heading_section(line: str) -> Optional[str]:
+        """Return the section a heading line opens, or None if it is not a heading"""
+        heading = line.strip().rstrip(':').strip().lower()
+        if not heading or len(heading) > 40:
+            return None
+        return _HEADING_LOOKUP.get(heading)
+
+    def has_section(self, name: str) -> bool:
+        """Whether a heading for the section was found"""
+        return name in self.sections
+
+    def region(self, *names: str) -> str:
+        """Return the text of the named sections, in document order of the names given"""
+        lines = []
+        for name in names:
+            lines.extend(self.sections.get(name, []))
+        return '\n'.join(lines)
@@ -0,0 +1,168 @@
+import argparse
+import hashlib
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+from utils.idf_model import IdfModel, iter_corpus_texts
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    'RESUME_ANALYZER_SEMANTIC_INDEX',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'lsa')
+)
+
+COMPONENTS_FILE = 'components.npy'
+VECTORS_FILE = 'vectors.npy'
+CENTROIDS_FILE = 'centroids.npy'
+OFFSETS_FILE = 'offsets.npy'
+KEYS_FILE = 'keys.json'
+TFIDF_DIR = 'tfidf'
+
+def spherical_kmeans(vectors: np.ndarray, n_lists: int, n_iter: int = 10, seed: int = 0) -> np.ndarray:
+    """Cluster unit vectors by cosine similarity; returns unit-length centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), size=n_lists, replace=False)].copy()
+    for _ in range(n_iter):
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        for cluster in range(n_lists):
+            members = vectors[assignments == cluster]
+            if len(members):
+                centroids[cluster] = members.sum(axis=0)
+        centroids = normalize(centroids)
+    return centroids.astype(np.float32)
+
+class SemanticIndex:
+    def __init__(self, idf_model: IdfModel, components: np.ndarray, vectors: np.ndarray,
+                 centroids: np.ndarray, offsets: np.ndarray, keys: List[str]):
+        """LSA projection plus an inverted-file (IVF) index of float32 resume vectors.
+
+        vectors are stored grouped by cluster: rows offsets[c]:offsets[c + 1] belong to
+        centroid c, so a query only scans the clusters nearest to it.
+        """
+        self.idf_model = idf_model
+        self.components = components
+        self.vectors = vectors
+        self.centroids = centroids
+        self.offsets = offsets
+        self.keys = keys
+        # Identifies the projection, so caches of similarities can be keyed on it
+        self.fingerprint = hashlib.sha1(
+            idf_model.fingerprint.encode('utf-8') + np.ascontiguousarray(components).tobytes()
+        ).hexdigest()[:12]
+
+    @classmethod
+    def build(cls, corpus_texts: Sequence[str], resume_texts: Sequence[str], keys: Sequence[str],
+              n_components: int = 128, n_lists: Optional[int] = None) -> 'SemanticIndex':
+        """Fit TF-IDF and a TruncatedSVD projection on the corpus, then index the resumes"""
+        idf_model = IdfModel.build(corpus_texts)
+        vocabulary_size = len(idf_model.vocabulary)
+        if vocabulary_size < 2:
+            # TruncatedSVD needs two features; a one-term space is already as small as it gets
+            components = np.eye(vocabulary_size, dtype=np.float32)
+        else:
+            svd = TruncatedSVD(n_components=max(1, min(n_components, vocabulary_size - 1)), random_state=0)
+            svd.fit(idf_model.transform(list(corpus_texts)))
+            components = svd.components_.astype(np.float32)
+
+        vectors = cls._project(idf_model, components, list(resume_texts))
+        n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+        n_lists = min(n_lists, len(vectors))
+        centroids = spherical_kmeans(vectors, n_lists)
+
+        # Group rows by cluster so each inverted list is one contiguous slice
+        assignments = np.argmax(vectors @ centroids.T, axis=1)
+        order = np.argsort(assignments, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+        return cls(idf_model, components, vectors[order], centroids, offsets, [keys[i] for i in order])
+
+    @staticmethod
+    def _project(idf_model: IdfModel, components: np.ndarray, texts: List[str]) -> np.ndarray:
+        """Unit-length float32 LSA vectors for preprocessed texts"""
+        projected = idf_model.transform(texts) @ components.T
+        return normalize(np.asarray(projected, dtype=np.float32)).astype(np.float32)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> 'SemanticIndex':
+        """Load an index; resume vectors are memory-mapped rather than read into memory"""
+        with open(os.path.join(path, KEYS_FILE), encoding='utf-8') as f:
+            keys = json.load(f)
+        return cls(
+            IdfModel.load(os.path.join(path, TFIDF_DIR)),
+            np.load(os.path.join(path, COMPONENTS_FILE)),
+            np.load(os.path.join(path, VECTORS_FILE), mmap_mode='r'),
+            np.load(os.path.join(path, CENTROIDS_FILE)),
+            np.load(os.path.join(path, OFFSETS_FILE)),
+            keys
+        )
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Write the projection, vectors and IVF structure to a directory"""
+        os.makedirs(path, exist_ok=True)
+        self.idf_model.save(os.path.join(path, TFIDF_DIR))
+        np.save(os.path.join(path, COMPONENTS_FILE), self.components)
+        np.save(os.path.join(path, VECTORS_FILE), np.asarray(self.vectors, dtype=np.float32))
+        np.save(os.path.join(path, CENTROIDS_FILE), self.centroids)
+        np.save(os.path.join(path, OFFSETS_FILE), self.offsets)
+        with open(os.path.join(path, KEYS_FILE), 'w', encoding='utf-8') as f:
+            json.dump(self.keys, f)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """LSA vectors for preprocessed texts"""
+        return self._project(self.idf_model, self.components, texts)
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        """Cosine similarity of two preprocessed texts in LSA space"""
+        vectors = self.embed([text_a, text_b])
+        return float(vectors[0] @ vectors[1])
+
+    def search(self, text: str, top_k: int = 50, n_probe: int = 8) -> List[Tuple[str, float]]:
+        """Approximate nearest resumes to a preprocessed text, scanning the n_probe nearest clusters"""
+        query = self.embed([text])[0]
+        n_probe = min(n_probe, len(self.centroids))
+        clusters = np.argpartition(-(self.centroids @ query), n_probe - 1)[:n_probe]
+
+        rows = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in clusters])
+        if not len(rows):
+            return []
+        scores = np.asarray(self.vectors[rows]) @ query
+        top_k = min(top_k, len(rows))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self.keys[rows[i]], float(scores[i])) for i in best]
+
+def load_semantic_index(path: Optional[str] = DEFAULT_INDEX_PATH) -> Optional[SemanticIndex]:
+    """Return the index saved at path, or None when it has not been built"""
+    if not path or not os.path.exists(os.path.join(path, VECTORS_FILE)):
+        return None
+    return SemanticIndex.load(path)
+
+def main():
+    """Fit LSA on a corpus and build the ANN index over a folder of resumes"""
+    from utils.analyzer import ResumeAnalyzer
+
+    arg_parser = argparse.ArgumentParser(description="Build the LSA semantic index")
+    arg_parser.add_argument('resumes', help="Folder of resumes to index (.txt/.pdf/.docx)")
+    arg_parser.add_argument('--corpus', nargs='*', default=[],
+                            help="Extra folders (e.g. job descriptions) used only to fit the projection")
+    arg_parser.add_argument('--out', default=DEFAULT_INDEX_PATH, help="Index directory to write")
+    arg_parser.add_argument('--components', type=int, default=128)
+    arg_parser.add_argument('--lists', type=int, default=None, help="Number of IVF clusters (default sqrt(N))")
+    args = arg_parser.parse_args()
+
+    analyzer = ResumeAnalyzer(idf_model_path=None)
+    resumes = [(path, analyzer.preprocess_text(text)) for path, text in iter_corpus_texts([args.resumes])]
+    extra = [analyzer.preprocess_text(text) for _, text in iter_corpus_texts(args.corpus)]
+    keys = [path for path, _ in resumes]
+    resume_texts = [text for _, text in resumes]
+
+    index = SemanticIndex.build(resume_texts + extra, resume_texts, keys,
+                                n_components=args.components, n_lists=args.lists)
+    index.save(args.out)
+    print(f"Indexed {len(keys)} resumes in {len(index.centroids)} lists at {args.out}")
+
+if __name__ == "__main__":
+    main()
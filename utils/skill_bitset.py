@@ -0,0 +1,65 @@
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+
+import numpy as np
+
+# Number of set bits in every possible byte
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+class SkillIndex:
+    def __init__(self, skills: Sequence[str]):
+        """Fixed integer IDs for the lowercased skills of a skills database"""
+        self.skills = tuple(skills)
+        self.ids: Dict[str, int] = {}
+        for skill in self.skills:
+            self.ids.setdefault(skill.lower(), len(self.ids))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def encode(self, skills: Iterable[str]) -> Tuple[np.ndarray, Set[str]]:
+        """Pack the known skills into a uint8 bitset; also return the distinct unknown ones, lowercased"""
+        bits = np.zeros(len(self.ids), dtype=bool)
+        unknown = set()
+        for skill in skills:
+            key = skill.lower()
+            skill_id = self.ids.get(key)
+            if skill_id is None:
+                unknown.add(key)
+            else:
+                bits[skill_id] = True
+        return np.packbits(bits), unknown
+
+    def encode_many(self, skill_lists: Sequence[Iterable[str]]) -> Tuple[np.ndarray, List[Set[str]]]:
+        """Pack many skill sets into one (rows x bytes) bitset matrix plus per-row unknown skills"""
+        bits = np.zeros((len(skill_lists), len(self.ids)), dtype=bool)
+        unknown = []
+        for row, skills in enumerate(skill_lists):
+            row_unknown = set()
+            for skill in skills:
+                key = skill.lower()
+                skill_id = self.ids.get(key)
+                if skill_id is None:
+                    row_unknown.add(key)
+                else:
+                    bits[row, skill_id] = True
+            unknown.append(row_unknown)
+        return np.packbits(bits, axis=-1), unknown
+
+    def contains(self, bitset: np.ndarray, skill: str) -> bool:
+        """Whether a known skill's bit is set"""
+        skill_id = self.ids.get(skill.lower())
+        if skill_id is None:
+            return False
+        return bool(bitset[skill_id >> 3] & (0x80 >> (skill_id & 7)))
+
+def popcount(bitsets: np.ndarray) -> np.ndarray:
+    """Number of set bits along the last axis"""
+    return _POPCOUNT[bitsets].sum(axis=-1, dtype=np.int64)
+
+def skill_match_counts(resume_bitsets: np.ndarray, required_bitset: np.ndarray) -> Dict[str, np.ndarray]:
+    """Matched, missing and additional counts of known skills for one or many resumes against one job"""
+    return {
+        'matched': popcount(resume_bitsets & required_bitset),
+        'missing': popcount(required_bitset & ~resume_bitsets),
+        'additional': popcount(resume_bitsets & ~required_bitset)
+    }
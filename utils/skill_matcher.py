@@ -0,0 +1,66 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Trie key marking the end of a skill; real keys are always single characters
+_END = ''
+_BOUNDARY = re.compile(r'\b')
+
+class SkillMatcher:
+    def __init__(self, skills: Sequence[str]):
+        """Build a character trie over the lowercased skills vocabulary"""
+        self.skills = tuple(skills)
+        self._trie: Dict = {}
+        # Longest lowercased skill; bounds how far an edit can affect nearby matches
+        self.max_length = 0
+
+        for skill in self.skills:
+            key = skill.lower()
+            if not key:
+                continue
+            node = self._trie
+            for char in key:
+                node = node.setdefault(char, {})
+            node.setdefault(_END, []).append(skill)
+            self.max_length = max(self.max_length, len(key))
+
+        # Candidate starts are word boundaries followed by the first character of some skill
+        first_chars = sorted(self._trie)
+        if first_chars:
+            self._start_pattern = re.compile(
+                r'\b(?=' + '|'.join(re.escape(char) for char in first_chars) + ')'
+            )
+        else:
+            self._start_pattern = None
+
+    def find_all(self, text_lower: str) -> List[str]:
+        """Return every skill occurring in already-lowercased text, with \\b...\\b semantics"""
+        return list({skill for _, skill in self.iter_matches(text_lower)})
+
+    def iter_matches(self, text_lower: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (position, skill) for every occurrence starting in text_lower[start:end].
+
+        Word boundaries are checked against the whole text, so scanning a window gives the
+        same occurrences as a full scan restricted to that window.
+        """
+        if self._start_pattern is None:
+            return
+
+        text_length = len(text_lower)
+        end = text_length if end is None else min(end, text_length)
+        for candidate in self._start_pattern.finditer(text_lower, start, end):
+            node = self._trie
+            position = candidate.start()
+            while position < text_length:
+                node = node.get(text_lower[position])
+                if node is None:
+                    break
+                position += 1
+                if _END in node and _BOUNDARY.match(text_lower, position):
+                    for skill in node[_END]:
+                        yield candidate.start(), skill
+
+@lru_cache(maxsize=8)
+def get_skill_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    """Return a compiled matcher, cached per distinct skills database"""
+    return SkillMatcher(skills)
@@ -0,0 +1,296 @@
+import math
+import re
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.utils import murmurhash3_32
+
+from utils.analyzer import ResumeAnalyzer
+from utils.document import Document
+from utils.resume_parser import EXPERIENCE_PATTERN
+from utils.skill_bitset import popcount
+from utils.skill_matcher import get_skill_matcher
+from data.skills_database import get_all_skills
+
+def common_affixes(old: str, new: str) -> Tuple[int, int]:
+    """Lengths of the common prefix and (non-overlapping) common suffix of two strings"""
+    limit = min(len(old), len(new))
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = low
+
+    low, high = 0, limit - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:] == new[len(new) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    return prefix, low
+
+class TermSpace(ABC):
+    def __init__(self, job_counts: Counter):
+        """Cosine similarity between a changing resume and a fixed job description, kept as running sums"""
+        self.job_counts = job_counts
+        self.dot = 0.0
+        self.resume_norm = 0.0
+        self.job_norm = 0.0
+
+    @abstractmethod
+    def update(self, term: str, old_count: int, new_count: int) -> None:
+        """Adjust the running sums for a term whose resume count changed"""
+
+    def similarity(self) -> float:
+        if self.resume_norm <= 0 or self.job_norm <= 0:
+            return 0.0
+        return self.dot / math.sqrt(self.resume_norm * self.job_norm)
+
+class WeightedTermSpace(TermSpace):
+    def __init__(self, job_counts: Counter, weights: Dict[str, float]):
+        """Fixed per-term weights, as with the pre-fit corpus IDF model; other terms are dropped"""
+        super().__init__(job_counts)
+        self.weights = weights
+        self.job_norm = sum((count * weights.get(term, 0.0)) ** 2 for term, count in job_counts.items())
+
+    def update(self, term: str, old_count: int, new_count: int) -> None:
+        weight = self.weights.get(term)
+        if not weight:
+            return
+        self.resume_norm += weight * weight * (new_count * new_count - old_count * old_count)
+        self.dot += weight * weight * self.job_counts.get(term, 0) * (new_count - old_count)
+
+class PairIdfTermSpace(TermSpace):
+    # Smoothed IDF fitted on the two compared documents: terms in one or in both of them
+    IDF_ONE = math.log(3 / 2) + 1
+    IDF_BOTH = 1.0
+
+    def __init__(self, job_counts: Counter):
+        """IDF fitted on the resume and job description pair, as the per-request vectorizer does"""
+        super().__init__(job_counts)
+        self.job_norm = sum((count * self.IDF_ONE) ** 2 for count in job_counts.values())
+
+    def update(self, term: str, old_count: int, new_count: int) -> None:
+        job_count = self.job_counts.get(term, 0)
+        if not job_count:
+            self.resume_norm += self.IDF_ONE ** 2 * (new_count * new_count - old_count * old_count)
+            return
+        self.resume_norm += self.IDF_BOTH ** 2 * (new_count * new_count - old_count * old_count)
+        self.dot += self.IDF_BOTH ** 2 * job_count * (new_count - old_count)
+        # The job side's weight for the term drops once the resume shares it
+        if not old_count or not new_count:
+            change = job_count * job_count * (self.IDF_BOTH ** 2 - self.IDF_ONE ** 2)
+            self.job_norm += change if new_count else -change
+
+class HashedTermSpace(TermSpace):
+    def __init__(self, job_counts: Counter, n_features: int):
+        """Feature-hashed counts, matching a HashingVectorizer with alternate_sign=False"""
+        super().__init__(job_counts)
+        self.n_features = n_features
+        self.resume_values: Dict[int, float] = {}
+        self.job_values: Dict[int, float] = {}
+        for term, count in job_counts.items():
+            index = self.index(term)
+            self.job_values[index] = self.job_values.get(index, 0.0) + count
+        self.job_norm = sum(value * value for value in self.job_values.values())
+
+    def index(self, term: str) -> int:
+        """Feature column of a term, computed as sklearn's hashing transform does"""
+        h = murmurhash3_32(term, seed=0)
+        if h == -2 ** 31:
+            return (2 ** 31 - 1 - (self.n_features - 1)) % self.n_features
+        return abs(h) % self.n_features
+
+    def update(self, term: str, old_count: int, new_count: int) -> None:
+        index = self.index(term)
+        old_value = self.resume_values.get(index, 0.0)
+        new_value = old_value + (new_count - old_count)
+        if new_value:
+            self.resume_values[index] = new_value
+        else:
+            self.resume_values.pop(index, None)
+        self.resume_norm += new_value * new_value - old_value * old_value
+        self.dot += self.job_values.get(index, 0.0) * (new_count - old_count)
+
+class WhatIfSession:
+    def __init__(self, analyzer: ResumeAnalyzer, job_description: str, skills_database: Optional[List[str]] = None):
+        """Live score preview of an edited resume against one job description.
+
+        Each update diffs the new text against the previous one and only re-tokenizes and
+        re-matches skills around the changed span, adjusting the term vector, the skill
+        bitset and the score components from the difference. Scores follow
+        perform_full_analysis exactly for the hashing engine and the corpus IDF model; with
+        per-request IDF fitting the preview ignores the vectorizer's max_features cap.
+        """
+        self.analyzer = analyzer
+        self.job_requirements = analyzer.get_job_requirements(job_description)
+        required_skills = self.job_requirements['technical_skills'] + self.job_requirements['all_keywords']
+        self._required_bits, _ = analyzer.skill_index.encode(required_skills)
+        self._resume_bits = np.zeros_like(self._required_bits)
+        self._skill_ids = analyzer.skill_index.ids
+        self._matcher = get_skill_matcher(tuple(skills_database or get_all_skills()))
+
+        # Tokenize exactly like the vectorizer behind calculate_similarity_score
+        if analyzer.similarity_engine == 'hashing':
+            vectorizer = analyzer.hashing_vectorizer
+        else:
+            vectorizer = analyzer.new_vectorizer()
+        self._token_pattern = re.compile(vectorizer.token_pattern)
+        self._stop_words = vectorizer.get_stop_words() or frozenset()
+        self._ngram_range = vectorizer.ngram_range
+
+        job_tokens = self._tokenize(Document.of(job_description).lower, 0, None)
+        job_counts = Counter(self._ngrams([token for _, _, token in job_tokens]))
+        if analyzer.similarity_engine == 'hashing':
+            self._space: TermSpace = HashedTermSpace(job_counts, vectorizer.n_features)
+        elif analyzer.idf_model is not None:
+            idf_model = analyzer.idf_model
+            weights = {term: float(idf_model.idf[index]) for term, index in idf_model.vocabulary.items()}
+            self._space = WeightedTermSpace(job_counts, weights)
+        else:
+            self._space = PairIdfTermSpace(job_counts)
+
+        self.text = ''
+        # Kept (non-stop-word) tokens of the lowercased text, with their spans
+        self._token_starts: List[int] = []
+        self._token_ends: List[int] = []
+        self._tokens: List[str] = []
+        self._term_counts: Counter = Counter()
+        # Skill occurrences by start position, and occurrences per lowercased skill
+        self._skill_starts: List[int] = []
+        self._skills: List[str] = []
+        self._skill_counts: Counter = Counter()
+        self._experience_years = 0
+
+    def _tokenize(self, text_lower: str, start: int, end: Optional[int]) -> List[Tuple[int, int, str]]:
+        end = len(text_lower) if end is None else end
+        return [
+            (match.start(), match.end(), match.group())
+            for match in self._token_pattern.finditer(text_lower, start, end)
+            if match.group() not in self._stop_words
+        ]
+
+    def _ngrams(self, tokens: List[str]) -> Iterable[str]:
+        min_n, max_n = self._ngram_range
+        for n in range(min_n, max_n + 1):
+            for i in range(len(tokens) - n + 1):
+                yield tokens[i] if n == 1 else ' '.join(tokens[i:i + n])
+
+    def update(self, text: str) -> Dict:
+        """Apply an edit and return the score preview"""
+        start_time = time.perf_counter()
+        old_lower, new_lower = self.text.lower(), text.lower()
+        prefix, suffix = common_affixes(old_lower, new_lower)
+        old_end, new_end = len(old_lower) - suffix, len(new_lower) - suffix
+
+        if prefix != old_end or prefix != new_end:
+            self._update_terms(new_lower, prefix, old_end, new_end)
+            self._update_skills(new_lower, prefix, old_end, new_end)
+            # Experience mentions are few and short; one compiled scan is cheaper than tracking them
+            years = [int(match.group(match.lastindex)) for match in EXPERIENCE_PATTERN.finditer(new_lower)]
+            self._experience_years = max(years) if years else 0
+        self.text = text
+
+        preview = self.score()
+        preview['update_ms'] = (time.perf_counter() - start_time) * 1000
+        return preview
+
+    def _update_terms(self, new_lower: str, prefix: int, old_end: int, new_end: int) -> None:
+        shift = new_end - old_end
+        # Widen the changed span to whitespace so no token straddles its edges
+        low = prefix
+        while low > 0 and not new_lower[low - 1].isspace():
+            low -= 1
+        high = new_end
+        while high < len(new_lower) and not new_lower[high].isspace():
+            high += 1
+
+        first = bisect_left(self._token_starts, low)
+        last = bisect_left(self._token_starts, high - shift)
+        new_tokens = self._tokenize(new_lower, low, high)
+
+        # n-grams entirely inside the unchanged context cancel out of the difference
+        context = self._ngram_range[1] - 1
+        context_start = max(0, first - context)
+        context_stop = min(len(self._tokens), last + context)
+        before = self._tokens[context_start:context_stop]
+        after = (self._tokens[context_start:first] + [token for _, _, token in new_tokens] +
+                 self._tokens[last:context_stop])
+        changes = Counter(self._ngrams(after))
+        changes.subtract(self._ngrams(before))
+
+        self._token_starts[first:] = ([start for start, _, _ in new_tokens] +
+                                      [start + shift for start in self._token_starts[last:]])
+        self._token_ends[first:] = ([end for _, end, _ in new_tokens] +
+                                    [end + shift for end in self._token_ends[last:]])
+        self._tokens[first:last] = [token for _, _, token in new_tokens]
+
+        for term, change in changes.items():
+            if not change:
+                continue
+            old_count = self._term_counts[term]
+            new_count = old_count + change
+            if new_count:
+                self._term_counts[term] = new_count
+            else:
+                del self._term_counts[term]
+            self._space.update(term, old_count, new_count)
+
+    def _update_skills(self, new_lower: str, prefix: int, old_end: int, new_end: int) -> None:
+        shift = new_end - old_end
+        # A match and the boundaries around it span at most max_length + 1 characters
+        low = max(0, prefix - self._matcher.max_length - 1)
+        first = bisect_left(self._skill_starts, low)
+        last = bisect_left(self._skill_starts, old_end + 1)
+        matches = list(self._matcher.iter_matches(new_lower, low, new_end + 1))
+
+        for skill in self._skills[first:last]:
+            key = skill.lower()
+            self._skill_counts[key] -= 1
+            if not self._skill_counts[key]:
+                del self._skill_counts[key]
+                self._set_skill_bit(key, False)
+        for _, skill in matches:
+            key = skill.lower()
+            self._skill_counts[key] += 1
+            if self._skill_counts[key] == 1:
+                self._set_skill_bit(key, True)
+
+        self._skill_starts[first:] = ([start for start, _ in matches] +
+                                      [start + shift for start in self._skill_starts[last:]])
+        self._skills[first:last] = [skill for _, skill in matches]
+
+    def _set_skill_bit(self, key: str, value: bool) -> None:
+        skill_id = self._skill_ids.get(key)
+        if skill_id is None:
+            return
+        mask = 0x80 >> (skill_id & 7)
+        if value:
+            self._resume_bits[skill_id >> 3] |= mask
+        else:
+            self._resume_bits[skill_id >> 3] &= ~mask & 0xFF
+
+    def score(self) -> Dict:
+        """Score components for the current text, on the scales of generate_score_breakdown"""
+        similarity_score = self._space.similarity() if self._term_counts else 0.0
+        matched = int(popcount(self._resume_bits & self._required_bits))
+        total_required = len(self.job_requirements['technical_skills'])
+        overall = self.analyzer.calculate_overall_scores(
+            similarity_score, matched, float(self._experience_years),
+            total_required, self.job_requirements['experience_years']
+        )
+        return {
+            'overall_score': min(int(overall), 100),
+            'similarity_score': round(similarity_score * 100, 1),
+            'skill_match_percentage': round(matched / total_required * 100, 1) if total_required else 0,
+            'matched_skills_count': matched,
+            'experience_years': self._experience_years
+        }
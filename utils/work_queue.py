@@ -0,0 +1,383 @@
+import json
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from utils.resume_parser import iter_resume_files
+
+# Task states: pending (claimable once available_at passes), leased (claimed until
+# lease_expires), done (result stored) and failed (out of attempts)
+STATUSES = ('pending', 'leased', 'done', 'failed')
+
+# Workers renew their leases every third of this (see LeaseHeartbeat), so it only bounds
+# how long a crashed worker's files stay unclaimable, not how long a file may take
+DEFAULT_LEASE_SECONDS = 60
+
+class WorkQueue:
+    def __init__(self, path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS, max_attempts: int = 3,
+                 backoff_seconds: float = 30, shared_storage: bool = False):
+        """Durable queue of resume files in a SQLite database, shared by any number of workers.
+
+        Workers claim files under a time-limited lease; a worker that dies simply lets its
+        lease expire and the files become claimable again. Failed files are retried with
+        exponential backoff until max_attempts. WAL mode needs every worker on one host;
+        with shared_storage the rollback journal is used instead, so workers on several
+        hosts can share the file on a network filesystem with working locks.
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Transactions are explicit (BEGIN IMMEDIATE), so claims never race
+        self._conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=' + ('DELETE' if shared_storage else 'WAL'))
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS tasks ('
+            ' task_id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            ' path TEXT UNIQUE NOT NULL,'
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' available_at REAL NOT NULL DEFAULT 0,'
+            ' lease_owner TEXT,'
+            ' lease_expires REAL,'
+            ' error TEXT,'
+            ' seconds REAL,'
+            ' result TEXT,'
+            ' updated_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, available_at)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str) -> None:
+        self._conn.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    def enqueue(self, paths: Iterable[str], batch_size: int = 1000) -> int:
+        """Add files not already queued; returns how many were new"""
+        added = 0
+        paths = iter(paths)
+        while True:
+            batch = [(path,) for _, path in zip(range(batch_size), paths)]
+            if not batch:
+                return added
+            with self._transaction():
+                before = self._conn.total_changes
+                self._conn.executemany('INSERT OR IGNORE INTO tasks (path) VALUES (?)', batch)
+                added += self._conn.total_changes - before
+
+    def claim(self, owner: str, limit: int = 1) -> List[str]:
+        """Lease up to limit claimable files to owner"""
+        now = time.time()
+        with self._transaction():
+            # Leases that ran out on their last attempt will not be retried
+            self._conn.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ?"
+                " WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            rows = self._conn.execute(
+                "SELECT task_id, path FROM tasks"
+                " WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_expires < ?)"
+                " ORDER BY task_id LIMIT ?",
+                (now, now, limit)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?,"
+                " attempts = attempts + 1, updated_at = ? WHERE task_id = ?",
+                [(owner, now + self.lease_seconds, now, task_id) for task_id, _ in rows]
+            )
+        return [path for _, path in rows]
+
+    def renew(self, path: str, owner: str) -> bool:
+        """Restart owner's lease on a file; False if the lease was lost to another worker"""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ?"
+                " WHERE path = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + self.lease_seconds, time.time(), path, owner)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, path: str, owner: str, record: Dict) -> bool:
+        """Store a file's result; False if owner no longer holds the lease"""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, seconds = ?, error = NULL,"
+                " lease_owner = NULL, updated_at = ? WHERE path = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(record, separators=(',', ':')), record.get('seconds'), time.time(), path, owner)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, path: str, owner: str, error: str) -> bool:
+        """Record a failed attempt, scheduling a retry with backoff while attempts remain"""
+        now = time.time()
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT attempts FROM tasks WHERE path = ? AND status = 'leased' AND lease_owner = ?", (path, owner)
+            ).fetchone()
+            if row is None:
+                return False
+            attempts = row[0]
+            if attempts >= self.max_attempts:
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'failed', error = ?, lease_owner = NULL, updated_at = ? WHERE path = ?",
+                    (error, now, path)
+                )
+            else:
+                # Exponential backoff with jitter, so a flaky file does not retry in lockstep
+                delay = self.backoff_seconds * 2 ** (attempts - 1) * random.uniform(0.5, 1.0)
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'pending', error = ?, available_at = ?, lease_owner = NULL,"
+                    " updated_at = ? WHERE path = ?",
+                    (error, now + delay, now, path)
+                )
+        return True
+
+    def next_wakeup(self) -> Optional[float]:
+        """When the next file becomes claimable, or None when nothing is left to run"""
+        row = self._conn.execute(
+            "SELECT MIN(CASE status WHEN 'pending' THEN available_at ELSE lease_expires END)"
+            " FROM tasks WHERE status IN ('pending', 'leased')"
+        ).fetchone()
+        return row[0]
+
+    def requeue_failed(self) -> int:
+        """Give failed files a fresh set of attempts"""
+        with self._transaction():
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'pending', attempts = 0, available_at = 0, updated_at = ?"
+                " WHERE status = 'failed'", (time.time(),)
+            )
+        return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Number of files in each state"""
+        counts = dict.fromkeys(STATUSES, 0)
+        for status, count in self._conn.execute('SELECT status, COUNT(*) FROM tasks GROUP BY status'):
+            counts[status] = count
+        return counts
+
+    def latency(self) -> Dict[str, float]:
+        """Mean and percentiles of per-file processing time over completed files"""
+        count, mean, maximum = self._conn.execute(
+            "SELECT COUNT(*), AVG(seconds), MAX(seconds) FROM tasks WHERE status = 'done'"
+        ).fetchone()
+        summary = {'mean': mean or 0.0, 'max': maximum or 0.0}
+        for name, q in (('p50', 50), ('p95', 95), ('p99', 99)):
+            row = self._conn.execute(
+                "SELECT seconds FROM tasks WHERE status = 'done' ORDER BY seconds LIMIT 1 OFFSET ?",
+                (min(count - 1, int(q / 100 * count)) if count else 0,)
+            ).fetchone()
+            summary[name] = row[0] if row else 0.0
+        return summary
+
+    def iter_records(self) -> Iterator[Dict]:
+        """Stored results of completed files and error records of failed ones, in queue order"""
+        rows = self._conn.execute(
+            "SELECT path, status, error, result FROM tasks WHERE status IN ('done', 'failed') ORDER BY task_id"
+        )
+        for path, status, error, result in rows:
+            yield json.loads(result) if status == 'done' else {'path': path, 'error': error}
+
+class LeaseHeartbeat:
+    def __init__(self, queue_factory: Callable[[], WorkQueue], owner: str, interval: float):
+        """Background thread renewing owner's held leases every interval seconds while it lives.
+
+        The thread opens its own queue with queue_factory, since SQLite connections stay
+        on the thread that made them.
+        """
+        self.owner = owner
+        self.interval = interval
+        self._queue_factory = queue_factory
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> 'LeaseHeartbeat':
+        self._thread.start()
+        return self
+
+    def hold(self, paths: Iterable[str]) -> None:
+        with self._lock:
+            self._held.update(paths)
+
+    def release(self, path: str) -> None:
+        with self._lock:
+            self._held.discard(path)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        queue = self._queue_factory()
+        try:
+            while not self._stopped.wait(self.interval):
+                with self._lock:
+                    paths = list(self._held)
+                for path in paths:
+                    # A lease already taken over stays lost; the work loop notices on complete
+                    if not queue.renew(path, self.owner):
+                        self.release(path)
+        finally:
+            queue.close()
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection):
+        """BEGIN IMMEDIATE ... COMMIT, rolled back on error"""
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute('BEGIN IMMEDIATE')
+        return self._conn
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+def init_queue(db_path: str, job_description: str, resumes: Union[str, Iterable[str]],
+               shared_storage: bool = False) -> Tuple[int, Dict[str, int]]:
+    """Create or extend a batch job; returns (newly queued files, counts per state).
+
+    The job description is stored with the queue, so workers on any host need only the
+    database. Re-running with the same job description only adds files not yet queued.
+    """
+    queue = WorkQueue(db_path, shared_storage=shared_storage)
+    try:
+        stored = queue.get_meta('job_description')
+        if stored is None:
+            queue.set_meta('job_description', job_description)
+        elif stored != job_description:
+            raise Exception(f"{db_path} belongs to a different job description; use a new database")
+        added = queue.enqueue(os.path.abspath(path) for path in iter_resume_files(resumes))
+        return added, queue.counts()
+    finally:
+        queue.close()
+
+def _work_loop(db_path: str, owner: str, chunksize: int, lease_seconds: float, max_attempts: int,
+               backoff_seconds: float, shared_storage: bool, poll_seconds: float) -> Dict[str, int]:
+    """Claim, process and record files until the queue has nothing left to run"""
+    from utils.batch import analyze_file
+    from utils.document import Document
+    from utils.pipeline import build_pipeline
+
+    queue = WorkQueue(db_path, lease_seconds, max_attempts, backoff_seconds, shared_storage)
+    job_description = queue.get_meta('job_description')
+    if job_description is None:
+        raise Exception(f"{db_path} has no job description; run 'queue init' first")
+    # One Document for the whole run, so the job description is preprocessed once per worker
+    job_description = Document(job_description)
+    pipeline = build_pipeline()
+    succeeded = failed = lost = 0
+    heartbeat = LeaseHeartbeat(
+        lambda: WorkQueue(db_path, lease_seconds, max_attempts, backoff_seconds, shared_storage),
+        owner, lease_seconds / 3
+    ).start()
+    try:
+        while True:
+            paths = queue.claim(owner, chunksize)
+            heartbeat.hold(paths)
+            if not paths:
+                wakeup = queue.next_wakeup()
+                if wakeup is None:
+                    break
+                # Wait for a backoff to end or a lost lease to expire
+                time.sleep(min(max(wakeup - time.time(), 0.1), poll_seconds))
+                continue
+            for path in paths:
+                # The heartbeat keeps the chunk's leases alive; this checks the file is still ours
+                if not queue.renew(path, owner):
+                    heartbeat.release(path)
+                    lost += 1
+                    continue
+                record = analyze_file(pipeline, path, job_description)
+                if record['error'] is None:
+                    recorded = queue.complete(path, owner, record)
+                else:
+                    recorded = queue.fail(path, owner, record['error'])
+                heartbeat.release(path)
+                # A lease that ran out mid-file belongs to another worker now; its result is dropped
+                if not recorded:
+                    lost += 1
+                elif record['error'] is None:
+                    succeeded += 1
+                else:
+                    failed += 1
+    finally:
+        heartbeat.stop()
+        queue.close()
+    return {'succeeded': succeeded, 'failed': failed, 'lost': lost}
+
+def work_queue(db_path: str, workers: Optional[int] = None, chunksize: int = 4,
+               lease_seconds: float = DEFAULT_LEASE_SECONDS, max_attempts: int = 3, backoff_seconds: float = 30,
+               shared_storage: bool = False, poll_seconds: float = 5) -> Dict:
+    """Run worker processes on this host until the queue is drained; returns a summary.
+
+    Any number of hosts can run this against the same database at the same time.
+    """
+    workers = workers or os.cpu_count() or 1
+    host = socket.gethostname()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_work_loop, db_path, f"{host}:{uuid.uuid4().hex[:12]}", chunksize, lease_seconds,
+                            max_attempts, backoff_seconds, shared_storage, poll_seconds)
+            for _ in range(workers)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+
+    queue = WorkQueue(db_path, shared_storage=shared_storage)
+    try:
+        succeeded = sum(result['succeeded'] for result in results)
+        failed = sum(result['failed'] for result in results)
+        # Same shape as run_batch's summary; failed counts attempts, retried ones included, and
+        # lost counts files whose lease expired before their result could be recorded
+        return {
+            'files': succeeded + failed,
+            'succeeded': succeeded,
+            'failed': failed,
+            'lost': sum(result['lost'] for result in results),
+            'elapsed_seconds': elapsed,
+            'files_per_second': (succeeded + failed) / elapsed if elapsed else 0.0,
+            'counts': queue.counts(),
+            'latency_seconds': queue.latency()
+        }
+    finally:
+        queue.close()
+
+def export_results(db_path: str, out_path: str, shared_storage: bool = False) -> int:
+    """Write completed and failed files as JSONL ('-' for stdout); returns the number of lines"""
+    queue = WorkQueue(db_path, shared_storage=shared_storage)
+    out = sys.stdout if out_path == '-' else open(out_path, 'w', encoding='utf-8')
+    lines = 0
+    try:
+        for record in queue.iter_records():
+            out.write(json.dumps(record) + '\n')
+            lines += 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        queue.close()
+    return lines